@@ -1,9 +1,13 @@
 from fastapi import APIRouter
-from app.routers import auth_routes,sso,goals,completions
+from app.routers import auth_routes,sso,goals,completions,metrics,history,events,sync
 
 router = APIRouter()
 
 router.include_router(auth_routes.router,tags=["Authentication"])
 router.include_router(sso.router,tags=["SSO"])
 router.include_router(goals.router,tags=["Goals"])
-router.include_router(completions.router, tags=["Sub-Goal Completion"])
\ No newline at end of file
+router.include_router(completions.router, tags=["Sub-Goal Completion"])
+router.include_router(metrics.router, tags=["Metrics"])
+router.include_router(history.router, tags=["History"])
+router.include_router(events.router, tags=["Events"])
+router.include_router(sync.router, tags=["Sync"])
@@ -4,43 +4,52 @@ and retrieving the current authenticated user.
 """
 
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db import get_db
+from db import get_async_db, get_db
 from models.models import Users
-from schemas.userschema import UserCreate, UserResponse
-from schemas.authschema import LoginRequest, RefreshTokenRequest
+from schemas.userschema import TimezoneUpdate, UserCreate, UserResponse
+from schemas.authschema import (
+    AccessTokenResponse,
+    LoginRequest,
+    MessageResponse,
+    RefreshTokenRequest,
+    TokenResponse,
+)
 from services.auth_service import (
     register_user,
     authenticate_user,
     refresh_access_token,
 )
-from utils.dependencies import get_current_user
+from utils.dependencies import get_current_user, get_current_principal
+from utils.user_cache import Principal
 from schemas.authschema import SetPasswordRequest
 from services.auth_service import set_password
+from services.user_service import set_timezone
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: Session = Depends(get_db)):
     """Register a new user."""
-    return register_user(db, user)
+    return await register_user(db, user)
 
 
-@router.post("/login")
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+@router.post("/login", response_model=TokenResponse)
+async def login(request: LoginRequest, db: Session = Depends(get_db)):
     """Authenticate a user and return access and refresh tokens."""
-    return authenticate_user(db, request.email, request.password)
+    return await authenticate_user(db, request.email, request.password)
 
 
-@router.post("/refresh")
+@router.post("/refresh", response_model=AccessTokenResponse)
 def refresh_token(request: RefreshTokenRequest):
     """Authenticate a user and return access and refresh tokens."""
     return refresh_access_token(request.refresh_token)
 
-@router.post("/set-password")
-def set_password_endpoint(
+@router.post("/set-password", response_model=MessageResponse)
+async def set_password_endpoint(
     request: SetPasswordRequest,
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
@@ -48,10 +57,20 @@ def set_password_endpoint(
     """
     Set a password for an SSO-only account.
     """
-    return set_password(db, current_user, request.password)
+    return await set_password(db, current_user, request.password)
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: Users = Depends(get_current_user)):
+def get_me(current_user: Principal = Depends(get_current_principal)):
     """Return details of the currently authenticated user."""
     return current_user
+
+
+@router.put("/me/timezone", response_model=UserResponse)
+async def set_timezone_endpoint(
+    request: TimezoneUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Set the timezone that defines the user's day boundary."""
+    return await set_timezone(db, current_user, request.timezone)
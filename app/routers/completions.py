@@ -1,22 +1,41 @@
+from typing import List
+
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import get_db
-from utils.dependencies import get_current_user
-from models.models import Users
-from schemas.completionschema import SubGoalCompleteRequest
-from services.completion_service import complete_subgoal
+from db import get_async_db
+from utils.dependencies import get_current_principal
+from utils.user_cache import Principal
+from schemas.completionschema import (
+    SubGoalBatchCompleteRequest,
+    SubGoalCompleteRequest,
+    SubGoalCompleteResponse,
+    SubGoalCompletionResult,
+)
+from services.completion_service import complete_subgoal, complete_subgoals_batch
 
 router = APIRouter(prefix="/subgoals")
 
-@router.post("/{subgoal_id}/complete")
-def complete_subgoal_route(
+@router.post("/batch-complete", response_model=List[SubGoalCompletionResult])
+async def complete_subgoals_batch_route(
+    payload: SubGoalBatchCompleteRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    # Outcomes are built from validated input; skip re-validation.
+    return ORJSONResponse(
+        await complete_subgoals_batch(db, current_user, payload.items)
+    )
+
+@router.post("/{subgoal_id}/complete", response_model=SubGoalCompleteResponse)
+async def complete_subgoal_route(
     subgoal_id: int,
     payload: SubGoalCompleteRequest,
-    db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    return complete_subgoal(
+    return await complete_subgoal(
         db,
         current_user,
         subgoal_id,
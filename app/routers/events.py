@@ -0,0 +1,53 @@
+import asyncio
+import os
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import get_async_db
+from utils.dependencies import get_current_principal
+from utils.events import event_broker
+from utils.user_cache import Principal
+
+router = APIRouter(prefix="/events")
+
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", 15))
+
+
+async def _event_stream(request: Request, user_id: int):
+    queue = event_broker.subscribe(user_id)
+    try:
+        yield b"retry: 3000\n\n"
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Comment line; keeps proxies from closing an idle stream.
+                yield b": ping\n\n"
+                continue
+            yield b"data: " + event + b"\n\n"
+    finally:
+        event_broker.unsubscribe(user_id, queue)
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Stream the user's goal, sub-goal and streak changes as Server-Sent Events.
+
+    Each event's data is a JSON object with a "type" field. A "resync"
+    event means events were dropped and the client should refetch.
+    """
+    # Authentication is done; do not hold a pooled connection for the
+    # lifetime of the stream.
+    await db.close()
+    return StreamingResponse(
+        _event_stream(request, current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
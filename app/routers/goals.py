@@ -1,58 +1,147 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from datetime import date
+from typing import List, Literal
 
-from db import get_db
-from utils.dependencies import get_current_user
-from models.models import Users
-from schemas.goalschema import GoalCreate, SubGoalCreate
+import orjson
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import get_async_db
+from utils.dependencies import get_current_principal
+from utils.timeutil import local_today
+from utils.user_cache import Principal
+from schemas.goalschema import (
+    GoalCreate,
+    GoalPage,
+    GoalResponse,
+    SubGoalCreate,
+    SubGoalResponse,
+)
+from schemas.progressschema import GoalHeatmap, GoalProgress
 from services.goal_service import (
     create_goal,
     create_subgoal,
     get_user_goals,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+)
+from services.progress_service import (
+    get_goal_heatmap,
+    get_goal_progress,
+    get_goals_progress,
+)
+from services.goal_cache import get_goal_tree_view, store_goal_tree_view
+from services.version_service import get_goals_version
+from utils.http_cache import (
+    conditional_body,
+    conditional_json,
+    etag_matches,
+    make_etag,
+    not_modified,
 )
 
 router = APIRouter(prefix="/goals")
 
-@router.post("", status_code=status.HTTP_201_CREATED)
-def create_goal_route(
+# Read routes below return service output (plain dicts built from trusted
+# DB rows) as ORJSONResponse (via conditional_json): the response models document the
+# shape, and FastAPI's validate-then-encode pass is skipped. They are
+# tagged with ETags derived from the user's goals version, so unchanged
+# data is answered with 304 before any goal is loaded. Serialized goal
+# listings are additionally kept in the per-user goal cache.
+
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=GoalResponse)
+async def create_goal_route(
     payload: GoalCreate,
-    db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    return create_goal(db, current_user, payload)
+    return await create_goal(db, current_user, payload)
 
-@router.post("/{goal_id}/subgoals", status_code=status.HTTP_201_CREATED)
-def create_subgoal_route(
+@router.post(
+    "/{goal_id}/subgoals",
+    status_code=status.HTTP_201_CREATED,
+    response_model=SubGoalResponse,
+)
+async def create_subgoal_route(
     goal_id: int,
     payload: SubGoalCreate,
-    db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    return await create_subgoal(db, current_user, goal_id, payload)
+
+@router.get("", response_model=GoalPage)
+async def get_my_goals(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    goal_status: Literal["active", "finished"] | None = Query(None, alias="status"),
+    start_from: date | None = None,
+    start_to: date | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    return create_subgoal(db, current_user, goal_id, payload)
+    # The active/finished filters depend on the user's current day.
+    view = f"{local_today(current_user.timezone).isoformat()}?{request.url.query}"
+    # Always checked against the DB: other workers' writes do not reach
+    # this process's cache.
+    version = await get_goals_version(db, current_user.id)
+    etag = make_etag("goals", current_user.id, version, view)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    body = get_goal_tree_view(current_user.id, view, version)
+    if body is not None:
+        return conditional_body(request, etag, body)
+    page = await get_user_goals(
+        db,
+        current_user,
+        cursor=cursor,
+        limit=limit,
+        goal_status=goal_status,
+        start_from=start_from,
+        start_to=start_to,
+    )
+    body = orjson.dumps(page)
+    store_goal_tree_view(current_user.id, view, version, body)
+    return conditional_body(request, etag, body)
 
-@router.get("")
-def get_my_goals(
-    db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
+@router.get("/progress", response_model=List[GoalProgress])
+async def get_my_goals_progress(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    goals = get_user_goals(db, current_user)
-    return [
-        {
-            "id": g.id,
-            "title": g.title,
-            "total_days": g.total_days,
-            "start_date": g.start_date,
-            "current_streak": g.current_streak,
-            "longest_streak": g.longest_streak,
-            "subgoals": [
-                {
-                    "id": sg.id,
-                    "name": sg.name,
-                    "weight": sg.weight,
-                }
-                for sg in g.subgoals
-            ],
-        }
-        for g in goals
-    ]
+    version = await get_goals_version(db, current_user.id)
+    etag = make_etag("progress", current_user.id, version)
+    return await conditional_json(
+        request, etag, lambda: get_goals_progress(db, current_user)
+    )
 
+@router.get("/{goal_id}/progress", response_model=GoalProgress)
+async def get_goal_progress_route(
+    request: Request,
+    goal_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    version = await get_goals_version(db, current_user.id)
+    etag = make_etag("progress", current_user.id, version, goal_id)
+    return await conditional_json(
+        request, etag, lambda: get_goal_progress(db, current_user, goal_id)
+    )
+
+@router.get("/{goal_id}/heatmap", response_model=GoalHeatmap)
+async def get_goal_heatmap_route(
+    request: Request,
+    goal_id: int,
+    intensity: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    version = await get_goals_version(db, current_user.id)
+    etag = make_etag("heatmap", current_user.id, version, goal_id, intensity)
+    return await conditional_json(
+        request,
+        etag,
+        lambda: get_goal_heatmap(db, current_user, goal_id, intensity),
+    )
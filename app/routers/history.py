@@ -0,0 +1,45 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import get_async_db
+from utils.dependencies import get_current_principal
+from utils.user_cache import Principal
+from schemas.historyschema import HistoryImportResponse
+from services.export_service import export_user_history
+from services.import_service import import_user_history
+
+router = APIRouter(prefix="/history")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+@router.get("/export")
+async def export_history(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Stream the user's goals, sub-goals and completions."""
+    return StreamingResponse(
+        export_user_history(current_user.id, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="goal-history.{export_format}"'
+        },
+    )
+
+@router.post("/import", response_model=HistoryImportResponse)
+async def import_history(
+    request: Request,
+    import_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Import goals, sub-goals and completions from the request body."""
+    return await import_user_history(
+        db, current_user, request.stream(), import_format
+    )
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+
+from db import pool_metrics
+from utils.dependencies import require_metrics_token
+from utils.events import event_broker
+from utils.security import token_cache_stats
+
+router = APIRouter(prefix="/metrics", dependencies=[Depends(require_metrics_token)])
+
+@router.get("/db-pool")
+def get_db_pool_metrics():
+    """Return database connection pool statistics."""
+    return pool_metrics()
+
+@router.get("/token-cache")
+def get_token_cache_metrics():
+    """Return access-token verification cache statistics."""
+    return token_cache_stats()
+
+@router.get("/events")
+def get_event_metrics():
+    """Return the number of event stream subscribers on this worker."""
+    return {"subscribers": event_broker.subscriber_count()}
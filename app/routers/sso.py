@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
 import httpx
 
-from db import get_db
+from db import get_async_db
+from schemas.authschema import TokenResponse
 from services.sso_service import handle_google_callback
 
 router = APIRouter(prefix="/auth/google")
@@ -24,10 +25,10 @@ def google_login():
     }
     return RedirectResponse(httpx.URL(GOOGLE_AUTH_URL, params=params))
 
-@router.get("/callback")
+@router.get("/callback", response_model=TokenResponse)
 async def google_callback(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     code = request.query_params.get("code")
     if not code:
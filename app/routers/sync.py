@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import get_async_db
+from utils.dependencies import get_current_principal
+from utils.user_cache import Principal
+from schemas.syncschema import SyncResponse
+from services.sync_service import DEFAULT_SYNC_LIMIT, MAX_SYNC_LIMIT, get_changes
+
+router = APIRouter(prefix="/sync")
+
+@router.get("", response_model=SyncResponse)
+async def sync_changes(
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_SYNC_LIMIT, ge=1, le=MAX_SYNC_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Return goals, sub-goals and completions changed or deleted since `cursor`.
+
+    Omit the cursor for a full sync. Keep requesting with the returned
+    cursor while `has_more` is true.
+    """
+    # Built from trusted DB rows; skip re-validation like the goal reads.
+    return ORJSONResponse(await get_changes(db, current_user, cursor, limit))
@@ -0,0 +1,105 @@
+"""
+Command-line maintenance tasks.
+
+Usage:
+    python cli.py migrate [REVISION]
+    python cli.py rebuild-progress [--goal-id ID ...]
+    python cli.py reconcile-streaks [--today YYYY-MM-DD] [--chunk-size N] [--workers N]
+    python cli.py reconcile-streaks [--chunk-size N] [--workers N]
+"""
+
+import argparse
+import asyncio
+import os
+from datetime import date
+
+from alembic import command
+from alembic.config import Config
+
+from db import open_async_session
+from services.reconcile_service import (
+    RECONCILE_CHUNK_GOALS,
+    RECONCILE_WORKERS,
+    reconcile_streaks,
+)
+from services.rollup_service import rebuild_daily_progress
+
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+
+def _migrate(args):
+    command.upgrade(Config(ALEMBIC_INI), args.revision)
+
+
+async def _rebuild_progress(args):
+    async with open_async_session() as db:
+        rows = await rebuild_daily_progress(db, args.goal_id)
+        await db.commit()
+    print(f"Rebuilt {rows} goal_daily_progress rows")
+
+
+async def _reconcile_streaks(args):
+    stats = await reconcile_streaks(chunk_size=args.chunk_size, workers=args.workers)
+    print(
+        f"Reconciled {stats['chunks']} goal chunks; "
+        f"broke streaks for {stats['users']} users"
+    )
+
+
+def main(argv=None):
+    """Parse arguments and run the selected command."""
+    parser = argparse.ArgumentParser(description="Goal tracker maintenance tasks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser(
+        "migrate",
+        help="Apply Alembic migrations",
+    )
+    migrate.add_argument(
+        "revision",
+        nargs="?",
+        default="head",
+        help="Target revision (default: head)",
+    )
+    migrate.set_defaults(handler=_migrate)
+
+    rebuild = commands.add_parser(
+        "rebuild-progress",
+        help="Backfill or rebuild the goal_daily_progress rollup",
+    )
+    rebuild.add_argument(
+        "--goal-id",
+        type=int,
+        action="append",
+        help="Only rebuild this goal (repeatable); defaults to all goals",
+    )
+    rebuild.set_defaults(handler=_rebuild_progress)
+
+    reconcile = commands.add_parser(
+        "reconcile-streaks",
+        help="Reset current streaks that ended before each user's local yesterday",
+    )
+    reconcile.add_argument(
+        "--chunk-size",
+        type=int,
+        default=RECONCILE_CHUNK_GOALS,
+        help=f"Goals per transaction (default: {RECONCILE_CHUNK_GOALS})",
+    )
+    reconcile.add_argument(
+        "--workers",
+        type=int,
+        default=RECONCILE_WORKERS,
+        help=f"Chunks processed concurrently (default: {RECONCILE_WORKERS})",
+    )
+    reconcile.set_defaults(handler=_reconcile_streaks)
+
+    args = parser.parse_args(argv)
+    if asyncio.iscoroutinefunction(args.handler):
+        asyncio.run(args.handler(args))
+    else:
+        args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
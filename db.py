@@ -1,27 +1,189 @@
 """
 Database configuration and session management.
 
-This module initializes the SQLAlchemy engine, session factory,
-and declarative base. It also provides a database dependency
-for FastAPI routes to safely acquire and release sessions.
+This module initializes the SQLAlchemy engines, session factories,
+and declarative base. It also provides database dependencies
+for FastAPI routes to safely acquire and release sessions: `get_db`
+for the synchronous stack and `get_async_db` for the asyncio (asyncpg)
+stack used by the request hot paths.
+
+Importing this module has no side effects beyond reading the
+environment: engines are created on first use (`get_engine`,
+`get_async_engine`), so workers do not touch the database until they
+serve a request. Schema changes are applied with Alembic
+(`python cli.py migrate`), never at import time.
+
+Connection pool sizing and timeouts are read from the environment:
+
+- DB_POOL_SIZE: persistent connections kept in the pool (default 5)
+- DB_MAX_OVERFLOW: extra connections allowed under load (default 10)
+- DB_POOL_TIMEOUT: seconds to wait for a free connection (default 30)
+- DB_POOL_RECYCLE: recycle connections older than N seconds (default -1, off)
+- DB_POOL_PRE_PING: test connections on checkout (default true)
+- DB_STATEMENT_TIMEOUT_MS: Postgres statement_timeout (default 0, off)
+
+Both engines share these settings. The async engine connects through
+ASYNC_DB_URL, or DB_URL with its driver switched to asyncpg.
 """
 
 import os
+import threading
+import time
+from typing import Optional
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DB_URL")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DB_URL")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", -1))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+
+
+class _WaitTimingMixin:
+    """Records how long pool checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_time_total += waited
+                self.wait_time_max = max(self.wait_time_max, waited)
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    """QueuePool that records checkout wait times."""
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    """asyncio-adapted QueuePool that records checkout wait times."""
+
+
+def _connect_args():
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        return {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+def _async_connect_args():
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        return {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+    return {}
+
+
+_POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
 
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL not found! Check your .env file.")
 
 Base = declarative_base()
-engine = create_engine(DATABASE_URL)
 
-Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Session = sessionmaker(autocommit=False, autoflush=False)
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_engine_lock = threading.Lock()
+
+
+def _database_url():
+    if not DATABASE_URL:
+        raise ValueError("DATABASE_URL not found! Check your .env file.")
+    return DATABASE_URL
+
+
+def async_database_url():
+    """Return the asyncpg URL: ASYNC_DB_URL, or DB_URL switched to asyncpg."""
+    return make_url(ASYNC_DATABASE_URL or _database_url()).set(
+        drivername="postgresql+asyncpg"
+    )
+
+
+def get_engine() -> Engine:
+    """Return the synchronous engine, creating it on first use."""
+    global _engine  # pylint: disable=global-statement
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(
+                    _database_url(),
+                    poolclass=InstrumentedQueuePool,
+                    connect_args=_connect_args(),
+                    **_POOL_OPTIONS,
+                )
+                Session.configure(bind=_engine)
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the asyncio engine, creating it on first use."""
+    global _async_engine  # pylint: disable=global-statement
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                _async_engine = create_async_engine(
+                    async_database_url(),
+                    poolclass=InstrumentedAsyncQueuePool,
+                    connect_args=_async_connect_args(),
+                    **_POOL_OPTIONS,
+                )
+                AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+def open_session():
+    """Return a new synchronous session bound to the lazily created engine."""
+    get_engine()
+    return Session()
+
+
+def open_async_session() -> AsyncSession:
+    """Return a new asyncio session bound to the lazily created engine."""
+    get_async_engine()
+    return AsyncSessionLocal()
+
+
+async def dispose_engines():
+    """Close all pooled connections of the engines created so far."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
 
 def get_db():
     """
@@ -30,10 +192,68 @@ def get_db():
     Yields:
         Session: SQLAlchemy database session.
 
-    Ensures the session is properly closed after use.
+    Rolls back any uncommitted work if the request fails and ensures
+    the session is properly closed after use.
     """
-    db = Session()
+    db = open_session()
     try:
         yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Provide an asyncio database session dependency.
+
+    Yields:
+        AsyncSession: SQLAlchemy asyncio session backed by asyncpg.
+
+    Rolls back any uncommitted work if the request fails and closes
+    the session after use.
+    """
+    async with open_async_session() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+
+def _queue_pool_metrics(pool):
+    metrics = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": DB_MAX_OVERFLOW,
+    }
+    if isinstance(pool, _WaitTimingMixin):
+        with pool._stats_lock:  # pylint: disable=protected-access
+            checkouts = pool.checkouts
+            metrics.update(
+                checkouts=checkouts,
+                wait_time_total=pool.wait_time_total,
+                wait_time_max=pool.wait_time_max,
+                wait_time_avg=pool.wait_time_total / checkouts if checkouts else 0.0,
+            )
+    return metrics
+
+
+def pool_metrics():
+    """
+    Return connection pool statistics for both engines.
+
+    Returns:
+        dict: Per engine ("sync", "async"): pool size, checked-in and
+        checked-out connections, current overflow and cumulative checkout
+        wait times (seconds). Engines that have not been created yet are
+        reported as None.
+    """
+    return {
+        "sync": _queue_pool_metrics(_engine.pool) if _engine else None,
+        "async": _queue_pool_metrics(_async_engine.pool) if _async_engine else None,
+    }
@@ -2,17 +2,45 @@
 FastAPI application entry point.
 
 This module initializes the FastAPI app, configures CORS middleware,
-creates database tables, and registers all API routes.
+and registers all API routes. Shared outbound resources (HTTP client,
+Google JWKS refresh, password worker pool, the event broker, the optional
+nightly streak reconciliation) and database engines are
+managed by the application lifespan. Importing it does not touch the
+database; the schema is managed with `python cli.py migrate`.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
-from db import Base,engine
+from fastapi.responses import ORJSONResponse
+from db import dispose_engines
 from app import route
+from services.reconcile_service import STREAK_RECONCILE_ENABLED, streak_reconciler
+from services.sso_service import google_jwks
+from utils.events import event_broker
+from utils.http_client import close_http_client, start_http_client
+from utils.password_pool import password_pool
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Start and stop application-wide resources."""
+    await start_http_client()
+    google_jwks.start()
+    await event_broker.start()
+    if STREAK_RECONCILE_ENABLED:
+        streak_reconciler.start()
+    yield
+    await streak_reconciler.stop()
+    await event_broker.stop()
+    await google_jwks.stop()
+    await close_http_client()
+    password_pool.shutdown()
+    await dispose_engines()
 
 
-app = FastAPI()
-Base.metadata.create_all(bind=engine)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 origins = [
     "http://localhost:5173",  
     "http://127.0.0.1:5173",
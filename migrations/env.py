@@ -0,0 +1,46 @@
+"""
+Alembic environment.
+
+Migrations run on the synchronous engine configured in `db.py`; the ORM
+models are imported so autogenerate can compare against `Base.metadata`.
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+
+from db import Base, get_engine
+import models.models  # noqa: F401  pylint: disable=unused-import
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Emit migration SQL without a database connection."""
+    context.configure(
+        url=get_engine().url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run migrations against the configured database."""
+    with get_engine().connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,108 @@
+"""Baseline schema: users, auth providers, goals, sub-goals, completions.
+
+Databases created before migrations existed (via create_all) already
+match this revision and should be marked with `alembic stamp 0001`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(100), nullable=True),
+        sa.Column("email", sa.String(150), nullable=False, unique=True),
+        sa.Column("password_hash", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.TIMESTAMP(), server_default=sa.func.now()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+
+    op.create_table(
+        "user_auth_providers",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("provider", sa.String(50), nullable=False),
+        sa.Column("provider_user_id", sa.String(255), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.func.now()),
+        sa.UniqueConstraint("provider", "provider_user_id", name="uix_provider_identity"),
+        sa.UniqueConstraint("user_id", "provider", name="uix_user_provider"),
+    )
+    op.create_index("ix_user_auth_providers_id", "user_auth_providers", ["id"])
+
+    op.create_table(
+        "goals",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("total_days", sa.Integer(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("current_streak", sa.Integer(), nullable=False),
+        sa.Column("longest_streak", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.TIMESTAMP(), server_default=sa.func.now()),
+        sa.CheckConstraint("total_days > 0", name="chk_goal_total_days"),
+    )
+    op.create_index("ix_goals_id", "goals", ["id"])
+
+    op.create_table(
+        "subgoals",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "goal_id",
+            sa.Integer(),
+            sa.ForeignKey("goals.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("weight", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.func.now()),
+        sa.UniqueConstraint("goal_id", "name", name="uix_goal_subgoal_name"),
+        sa.CheckConstraint("weight > 0", name="chk_subgoal_weight"),
+    )
+    op.create_index("ix_subgoals_id", "subgoals", ["id"])
+
+    op.create_table(
+        "subgoal_daily_completion",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "subgoal_id",
+            sa.Integer(),
+            sa.ForeignKey("subgoals.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("completed_on", sa.Date(), nullable=False),
+        sa.Column("completed", sa.Boolean(), nullable=False),
+        sa.Column("completed_at", sa.TIMESTAMP(), server_default=sa.func.now()),
+        sa.UniqueConstraint("subgoal_id", "completed_on", name="uix_subgoal_completed_day"),
+    )
+    op.create_index("ix_subgoal_daily_completion_id", "subgoal_daily_completion", ["id"])
+
+
+def downgrade():
+    op.drop_table("subgoal_daily_completion")
+    op.drop_table("subgoals")
+    op.drop_table("goals")
+    op.drop_table("user_auth_providers")
+    op.drop_table("users")
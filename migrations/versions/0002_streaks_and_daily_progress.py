@@ -0,0 +1,67 @@
+"""Streak runs, goals.last_streak_day and the goal_daily_progress rollup.
+
+The rollup is backfilled from existing completions. Streak runs and
+counters are backfilled from the rollup by revision 0007.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("goals", sa.Column("last_streak_day", sa.Date(), nullable=True))
+
+    op.create_table(
+        "goal_streak_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "goal_id",
+            sa.Integer(),
+            sa.ForeignKey("goals.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("start_day", sa.Date(), nullable=False),
+        sa.Column("end_day", sa.Date(), nullable=False),
+        sa.UniqueConstraint("goal_id", "start_day", name="uix_goal_streak_run_start"),
+        sa.UniqueConstraint("goal_id", "end_day", name="uix_goal_streak_run_end"),
+        sa.CheckConstraint("end_day >= start_day", name="chk_streak_run_order"),
+    )
+    op.create_index("ix_goal_streak_runs_id", "goal_streak_runs", ["id"])
+
+    op.create_table(
+        "goal_daily_progress",
+        sa.Column(
+            "goal_id",
+            sa.Integer(),
+            sa.ForeignKey("goals.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("done_weight", sa.Float(), nullable=False),
+        sa.Column("completed_count", sa.Integer(), nullable=False),
+    )
+    op.execute(
+        """
+        INSERT INTO goal_daily_progress (goal_id, day, done_weight, completed_count)
+        SELECT s.goal_id, c.completed_on, SUM(s.weight), COUNT(*)
+        FROM subgoal_daily_completion c
+        JOIN subgoals s ON s.id = c.subgoal_id
+        WHERE c.completed
+        GROUP BY s.goal_id, c.completed_on
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("goal_daily_progress")
+    op.drop_table("goal_streak_runs")
+    op.drop_column("goals", "last_streak_day")
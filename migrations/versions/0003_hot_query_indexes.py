@@ -0,0 +1,40 @@
+"""Index goals by owner for the goals listing and ownership checks.
+
+`goals(user_id, created_at, id)` serves the keyset-paginated listing and
+every `Goals.user_id == ...` ownership filter. Sub-goal lookups by
+goal_id and completion lookups by (subgoal_id, completed_on) are already
+served by the uix_goal_subgoal_name and uix_subgoal_completed_day
+unique indexes, so no duplicate indexes are added for them.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction; avoid locking writes
+    # on large goals tables while the index builds.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_goals_user_created",
+            "goals",
+            ["user_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_goals_user_created",
+            table_name="goals",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,25 @@
+"""Per-user IANA timezone defining the day boundary.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "users",
+        sa.Column("timezone", sa.String(64), nullable=False, server_default="UTC"),
+    )
+
+
+def downgrade():
+    op.drop_column("users", "timezone")
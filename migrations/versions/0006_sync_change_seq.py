@@ -0,0 +1,244 @@
+"""Change sequences and tombstones for delta sync.
+
+Goals, sub-goals and completions get a `change_seq` from the global
+``sync_change_seq`` sequence. Inserts take it from the column default. A
+row trigger assigns a new value on every update, and statement triggers
+bump the parent goal whenever a sub-goal or completion is inserted,
+updated or deleted. Deletes are recorded in `sync_tombstones`. Children
+removed by a cascading goal delete get no tombstone of their own,
+because the goal's tombstone covers them.
+
+The columns are added as nullable and the column default is set in a
+separate statement; both are catalog-only changes, so the first
+transaction holds its exclusive locks only briefly and commits. Existing
+rows are then backfilled in autocommit batches of `BACKFILL_BATCH` rows,
+so no single transaction locks a whole table. NOT NULL is proven by a
+``CHECK ... NOT VALID`` constraint that is validated without blocking
+writes; Postgres uses it to skip the scan for ``SET NOT NULL``, and the
+check is dropped afterwards. The indexes are built concurrently, and the
+triggers are created last so the backfill does not fire them.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+_SEQ_DEFAULT = "nextval('sync_change_seq')"
+
+BACKFILL_BATCH = int(os.getenv("SYNC_BACKFILL_BATCH", 10000))
+
+_TABLES = ("goals", "subgoals", "subgoal_daily_completion")
+
+_INDEXES = (
+    ("ix_goals_user_change_seq", "goals", ["user_id", "change_seq"]),
+    ("ix_subgoals_goal_change_seq", "subgoals", ["goal_id", "change_seq"]),
+    (
+        "ix_completion_subgoal_change_seq",
+        "subgoal_daily_completion",
+        ["subgoal_id", "change_seq"],
+    ),
+)
+
+_FUNCTIONS = """
+CREATE FUNCTION sync_bump_change_seq() RETURNS trigger AS $$
+BEGIN
+    IF NEW.change_seq = OLD.change_seq THEN
+        NEW.change_seq := nextval('sync_change_seq');
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION sync_touch_goals_from_subgoals() RETURNS trigger AS $$
+BEGIN
+    UPDATE goals SET change_seq = nextval('sync_change_seq')
+    WHERE id IN (SELECT goal_id FROM changed_rows);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION sync_touch_goals_from_completions() RETURNS trigger AS $$
+BEGIN
+    UPDATE goals SET change_seq = nextval('sync_change_seq')
+    WHERE id IN (
+        SELECT s.goal_id FROM subgoals s
+        JOIN changed_rows c ON c.subgoal_id = s.id
+    );
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION sync_tombstone_goals() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstones (user_id, entity, entity_id)
+    SELECT c.user_id, 'goal', c.id FROM changed_rows c
+    WHERE EXISTS (SELECT 1 FROM users u WHERE u.id = c.user_id);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION sync_tombstone_subgoals() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstones (user_id, entity, entity_id)
+    SELECT g.user_id, 'subgoal', c.id FROM changed_rows c
+    JOIN goals g ON g.id = c.goal_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION sync_tombstone_completions() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstones (user_id, entity, entity_id)
+    SELECT g.user_id, 'completion', c.id FROM changed_rows c
+    JOIN subgoals s ON s.id = c.subgoal_id
+    JOIN goals g ON g.id = s.goal_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+_TRIGGERS = """
+CREATE TRIGGER goals_change_seq BEFORE UPDATE ON goals
+    FOR EACH ROW EXECUTE FUNCTION sync_bump_change_seq();
+CREATE TRIGGER subgoals_change_seq BEFORE UPDATE ON subgoals
+    FOR EACH ROW EXECUTE FUNCTION sync_bump_change_seq();
+CREATE TRIGGER completion_change_seq BEFORE UPDATE ON subgoal_daily_completion
+    FOR EACH ROW EXECUTE FUNCTION sync_bump_change_seq();
+
+CREATE TRIGGER subgoals_touch_goal_ins AFTER INSERT ON subgoals
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_touch_goals_from_subgoals();
+CREATE TRIGGER subgoals_touch_goal_upd AFTER UPDATE ON subgoals
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_touch_goals_from_subgoals();
+CREATE TRIGGER subgoals_touch_goal_del AFTER DELETE ON subgoals
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_touch_goals_from_subgoals();
+
+CREATE TRIGGER completion_touch_goal_ins AFTER INSERT ON subgoal_daily_completion
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_touch_goals_from_completions();
+CREATE TRIGGER completion_touch_goal_upd AFTER UPDATE ON subgoal_daily_completion
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_touch_goals_from_completions();
+CREATE TRIGGER completion_touch_goal_del AFTER DELETE ON subgoal_daily_completion
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_touch_goals_from_completions();
+
+CREATE TRIGGER goals_tombstone AFTER DELETE ON goals
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_tombstone_goals();
+CREATE TRIGGER subgoals_tombstone AFTER DELETE ON subgoals
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_tombstone_subgoals();
+CREATE TRIGGER completion_tombstone AFTER DELETE ON subgoal_daily_completion
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_tombstone_completions();
+"""
+
+
+def _backfill(table):
+    """Give existing rows a change_seq, one short transaction per batch."""
+    conn = op.get_bind()
+    backfill = sa.text(
+        f"UPDATE {table} SET change_seq = {_SEQ_DEFAULT} "
+        f"WHERE id IN (SELECT id FROM {table} WHERE change_seq IS NULL LIMIT :batch)"
+    )
+    while conn.execute(backfill, {"batch": BACKFILL_BATCH}).rowcount:
+        pass
+
+    check = f"{table}_change_seq_not_null"
+    conn.execute(sa.text(
+        f"ALTER TABLE {table} ADD CONSTRAINT {check} "
+        "CHECK (change_seq IS NOT NULL) NOT VALID"
+    ))
+    conn.execute(sa.text(f"ALTER TABLE {table} VALIDATE CONSTRAINT {check}"))
+    conn.execute(sa.text(f"ALTER TABLE {table} ALTER COLUMN change_seq SET NOT NULL"))
+    conn.execute(sa.text(f"ALTER TABLE {table} DROP CONSTRAINT {check}"))
+
+
+def upgrade():
+    op.execute("CREATE SEQUENCE sync_change_seq")
+
+    for table in _TABLES:
+        op.add_column(table, sa.Column("change_seq", sa.BigInteger(), nullable=True))
+        op.alter_column(table, "change_seq", server_default=sa.text(_SEQ_DEFAULT))
+
+    op.create_table(
+        "sync_tombstones",
+        sa.Column(
+            "change_seq",
+            sa.BigInteger(),
+            primary_key=True,
+            server_default=sa.text(_SEQ_DEFAULT),
+        ),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("entity", sa.String(16), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.TIMESTAMP(), server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_sync_tombstones_user_change_seq",
+        "sync_tombstones",
+        ["user_id", "change_seq"],
+    )
+
+    with op.get_context().autocommit_block():
+        for table in _TABLES:
+            _backfill(table)
+        for name, table, columns in _INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+    op.execute(_FUNCTIONS)
+    op.execute(_TRIGGERS)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _columns in _INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    for trigger, table in (
+        ("goals_change_seq", "goals"),
+        ("subgoals_change_seq", "subgoals"),
+        ("completion_change_seq", "subgoal_daily_completion"),
+        ("subgoals_touch_goal_ins", "subgoals"),
+        ("subgoals_touch_goal_upd", "subgoals"),
+        ("subgoals_touch_goal_del", "subgoals"),
+        ("completion_touch_goal_ins", "subgoal_daily_completion"),
+        ("completion_touch_goal_upd", "subgoal_daily_completion"),
+        ("completion_touch_goal_del", "subgoal_daily_completion"),
+        ("goals_tombstone", "goals"),
+        ("subgoals_tombstone", "subgoals"),
+        ("completion_tombstone", "subgoal_daily_completion"),
+    ):
+        op.execute(f"DROP TRIGGER {trigger} ON {table}")
+    for function in (
+        "sync_bump_change_seq",
+        "sync_touch_goals_from_subgoals",
+        "sync_touch_goals_from_completions",
+        "sync_tombstone_goals",
+        "sync_tombstone_subgoals",
+        "sync_tombstone_completions",
+    ):
+        op.execute(f"DROP FUNCTION {function}()")
+
+    op.drop_table("sync_tombstones")
+    for table in _TABLES:
+        op.drop_column(table, "change_seq")
+    op.execute("DROP SEQUENCE sync_change_seq")
@@ -0,0 +1,114 @@
+"""Backfill goal_streak_runs and the goal streak counters.
+
+Revision 0002 created `goal_streak_runs` and `goals.last_streak_day` but
+left them empty. Before that revision, `current_streak` and
+`longest_streak` were never maintained. This revision rebuilds all four
+from the `goal_daily_progress` rollup. It uses the same gaps-and-islands
+grouping as `rebuild_goal_streaks`. A run still counts as current if it
+ends on or after the owner's local yesterday.
+
+The rebuild is idempotent. Goals whose counters change get a new
+`change_seq` from the 0006 trigger, and their users' `goals_version` is
+bumped, so cached listings and ETags are invalidated.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# Keep in step with services.streak_service.
+STREAK_DAY_THRESHOLD = float(os.getenv("STREAK_DAY_THRESHOLD", 1.0))
+_EPSILON = 1e-9
+
+_REBUILD_RUNS = """
+INSERT INTO goal_streak_runs (goal_id, start_day, end_day)
+SELECT q.goal_id, MIN(q.day), MAX(q.day)
+FROM (
+    SELECT
+        p.goal_id,
+        p.day,
+        -- Postgres has date - integer but no date - bigint.
+        p.day - CAST(ROW_NUMBER() OVER (PARTITION BY p.goal_id ORDER BY p.day) AS integer)
+            AS island
+    FROM goal_daily_progress p
+    JOIN (
+        SELECT goal_id, SUM(weight) AS total_weight
+        FROM subgoals
+        GROUP BY goal_id
+    ) w ON w.goal_id = p.goal_id
+    WHERE p.done_weight + :epsilon >= w.total_weight * :threshold
+) q
+GROUP BY q.goal_id, q.island
+"""
+
+_UPDATE_COUNTERS = """
+WITH runs AS (
+    SELECT
+        goal_id,
+        end_day,
+        end_day - start_day + 1 AS length,
+        ROW_NUMBER() OVER (PARTITION BY goal_id ORDER BY end_day DESC) AS recency
+    FROM goal_streak_runs
+),
+summary AS (
+    SELECT
+        goal_id,
+        MAX(length) AS longest,
+        MAX(end_day) AS last_day,
+        MAX(length) FILTER (WHERE recency = 1) AS last_length
+    FROM runs
+    GROUP BY goal_id
+),
+computed AS (
+    SELECT
+        g.id,
+        COALESCE(s.longest, 0) AS longest,
+        s.last_day,
+        CASE
+            WHEN s.last_day >= (now() AT TIME ZONE u.timezone)::date - 1 THEN s.last_length
+            ELSE 0
+        END AS current_length
+    FROM goals g
+    JOIN users u ON u.id = g.user_id
+    LEFT JOIN summary s ON s.goal_id = g.id
+),
+changed AS (
+    UPDATE goals g
+    SET longest_streak = c.longest,
+        current_streak = c.current_length,
+        last_streak_day = c.last_day
+    FROM computed c
+    WHERE g.id = c.id
+      AND (g.longest_streak, g.current_streak, g.last_streak_day)
+          IS DISTINCT FROM (c.longest, c.current_length, c.last_day)
+    RETURNING g.user_id
+)
+UPDATE users
+SET goals_version = goals_version + 1
+WHERE id IN (SELECT user_id FROM changed)
+"""
+
+
+def upgrade():
+    op.execute("DELETE FROM goal_streak_runs")
+    op.execute(
+        sa.text(_REBUILD_RUNS).bindparams(
+            epsilon=_EPSILON, threshold=STREAK_DAY_THRESHOLD
+        )
+    )
+    op.execute(_UPDATE_COUNTERS)
+
+
+def downgrade():
+    # The backfilled values are valid data for 0006; nothing to undo.
+    pass
@@ -7,12 +7,20 @@ Includes:
 - Goals
 - Sub-goals with weightage
 - Daily sub-goal completion (streak & progress source of truth)
+- Goal streak runs (consecutive qualifying days, maintained on write)
+- Goal daily progress rollup (summed completed weight per goal and day)
+- Sync tombstones (deleted rows, for delta sync)
+
+Goals, sub-goals and completions carry a `change_seq` drawn from the
+global ``sync_change_seq`` sequence on insert and on every update, kept
+by database triggers (see migration 0006).
 """
 
 # pylint: disable=too-few-public-methods,not-callable
 
 from sqlalchemy import (
     Column,
+    BigInteger,
     Integer,
     String,
     Text,
@@ -21,14 +29,27 @@ from sqlalchemy import (
     Float,
     TIMESTAMP,
     ForeignKey,
+    Index,
     UniqueConstraint,
     CheckConstraint,
+    FetchedValue,
     func,
+    text,
 )
 from sqlalchemy.orm import relationship
 
 from db import Base
 
+
+def _change_seq_column():
+    """Monotonic change sequence assigned by the database on insert/update."""
+    return Column(
+        BigInteger,
+        nullable=False,
+        server_default=text("nextval('sync_change_seq')"),
+        server_onupdate=FetchedValue(),
+    )
+
 class Users(Base):
     """User accounts (password-based and/or SSO)."""
 
@@ -39,6 +60,12 @@ class Users(Base):
     email = Column(String(150), unique=True, nullable=False)
     password_hash = Column(Text, nullable=True)
 
+    # IANA zone name; defines the user's day boundary for completions/streaks.
+    timezone = Column(String(64), nullable=False, default="UTC", server_default="UTC")
+
+    # Bumped on every write to the user's goals; drives HTTP ETags.
+    goals_version = Column(Integer, nullable=False, default=0, server_default="0")
+
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(
         TIMESTAMP,
@@ -107,6 +134,7 @@ class Goals(Base):
 
     current_streak = Column(Integer, default=0, nullable=False)
     longest_streak = Column(Integer, default=0, nullable=False)
+    last_streak_day = Column(Date, nullable=True)
 
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(
@@ -114,9 +142,13 @@ class Goals(Base):
         server_default=func.now(),
         onupdate=func.now(),
     )
+    # Also bumped when one of the goal's sub-goals or completions changes.
+    change_seq = _change_seq_column()
 
     __table_args__ = (
         CheckConstraint("total_days > 0", name="chk_goal_total_days"),
+        Index("ix_goals_user_created", "user_id", "created_at", "id"),
+        Index("ix_goals_user_change_seq", "user_id", "change_seq"),
     )
 
     user = relationship("Users", back_populates="goals")
@@ -127,6 +159,18 @@ class Goals(Base):
         cascade="all, delete-orphan",
     )
 
+    streak_runs = relationship(
+        "GoalStreakRuns",
+        back_populates="goal",
+        cascade="all, delete-orphan",
+    )
+
+    daily_progress = relationship(
+        "GoalDailyProgress",
+        back_populates="goal",
+        cascade="all, delete-orphan",
+    )
+
 class SubGoals(Base):
     """Sub-goals belonging to a goal, with relative weightage."""
 
@@ -143,6 +187,7 @@ class SubGoals(Base):
     weight = Column(Float, nullable=False, default=1.0)
 
     created_at = Column(TIMESTAMP, server_default=func.now())
+    change_seq = _change_seq_column()
 
     __table_args__ = (
         UniqueConstraint(
@@ -151,6 +196,7 @@ class SubGoals(Base):
             name="uix_goal_subgoal_name",
         ),
         CheckConstraint("weight > 0", name="chk_subgoal_weight"),
+        Index("ix_subgoals_goal_change_seq", "goal_id", "change_seq"),
     )
 
     goal = relationship("Goals", back_populates="subgoals")
@@ -176,6 +222,7 @@ class SubGoalDailyCompletion(Base):
     completed_on = Column(Date, nullable=False)
     completed = Column(Boolean, nullable=False, default=True)
     completed_at = Column(TIMESTAMP, server_default=func.now())
+    change_seq = _change_seq_column()
 
     __table_args__ = (
         UniqueConstraint(
@@ -183,6 +230,79 @@ class SubGoalDailyCompletion(Base):
             "completed_on",
             name="uix_subgoal_completed_day",
         ),
+        Index("ix_completion_subgoal_change_seq", "subgoal_id", "change_seq"),
     )
 
     subgoal = relationship("SubGoals", back_populates="daily_completions")
+
+class GoalStreakRuns(Base):
+    """Runs of consecutive days on which a goal met its streak threshold."""
+
+    __tablename__ = "goal_streak_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    goal_id = Column(
+        Integer,
+        ForeignKey("goals.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    start_day = Column(Date, nullable=False)
+    end_day = Column(Date, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "goal_id",
+            "start_day",
+            name="uix_goal_streak_run_start",
+        ),
+        UniqueConstraint(
+            "goal_id",
+            "end_day",
+            name="uix_goal_streak_run_end",
+        ),
+        CheckConstraint("end_day >= start_day", name="chk_streak_run_order"),
+    )
+
+    goal = relationship("Goals", back_populates="streak_runs")
+
+class GoalDailyProgress(Base):
+    """Per-day rollup of completed sub-goal weight, maintained on write."""
+
+    __tablename__ = "goal_daily_progress"
+
+    goal_id = Column(
+        Integer,
+        ForeignKey("goals.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day = Column(Date, primary_key=True)
+
+    done_weight = Column(Float, nullable=False, default=0.0)
+    completed_count = Column(Integer, nullable=False, default=0)
+
+    goal = relationship("Goals", back_populates="daily_progress")
+
+class SyncTombstones(Base):
+    """Deleted goals, sub-goals and completions, written by triggers."""
+
+    __tablename__ = "sync_tombstones"
+
+    change_seq = Column(
+        BigInteger,
+        primary_key=True,
+        server_default=text("nextval('sync_change_seq')"),
+    )
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    entity = Column(String(16), nullable=False)  # goal, subgoal, completion
+    entity_id = Column(Integer, nullable=False)
+
+    deleted_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_change_seq", "user_id", "change_seq"),
+    )
@@ -29,3 +29,41 @@ class RefreshTokenRequest(BaseModel):
 
 class SetPasswordRequest(BaseModel):
     password: str = Field(min_length=8, max_length=128)
+
+
+class TokenResponse(BaseModel):
+    """
+    Access and refresh tokens issued after a successful login.
+
+    Attributes:
+        access_token (str): Short-lived JWT access token.
+        refresh_token (str): Long-lived JWT refresh token.
+        token_type (str): Always "bearer".
+        user_id (int | None): Authenticated user's id.
+    """
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    user_id: int | None = None
+
+
+class AccessTokenResponse(BaseModel):
+    """
+    Access token issued from a refresh token.
+
+    Attributes:
+        access_token (str): Short-lived JWT access token.
+        token_type (str): Always "bearer".
+    """
+    access_token: str
+    token_type: str = "bearer"
+
+
+class MessageResponse(BaseModel):
+    """
+    Generic confirmation message.
+
+    Attributes:
+        message (str): Human-readable outcome.
+    """
+    message: str
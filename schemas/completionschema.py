@@ -1,6 +1,32 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
+from typing import List, Literal
+
+MAX_BATCH_ITEMS = 500
 
 
 class SubGoalCompleteRequest(BaseModel):
     completed_on: date | None = None
+
+
+class SubGoalCompleteResponse(BaseModel):
+    message: str
+    current_streak: int | None = None
+    longest_streak: int | None = None
+
+
+class SubGoalCompletionItem(BaseModel):
+    subgoal_id: int
+    completed_on: date | None = None
+
+
+class SubGoalBatchCompleteRequest(BaseModel):
+    items: List[SubGoalCompletionItem] = Field(
+        min_length=1, max_length=MAX_BATCH_ITEMS
+    )
+
+
+class SubGoalCompletionResult(BaseModel):
+    subgoal_id: int
+    completed_on: date
+    status: Literal["completed", "already_completed", "not_found", "future_day"]
@@ -33,3 +33,12 @@ class SubGoalResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class GoalTreeResponse(GoalResponse):
+    subgoals: List[SubGoalResponse]
+
+
+class GoalPage(BaseModel):
+    items: List[GoalTreeResponse]
+    next_cursor: str | None = None
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class ImportCounts(BaseModel):
+    goals: int
+    subgoals: int
+    completions: int
+
+
+class ImportRecordError(BaseModel):
+    line: int
+    error: str
+
+
+class HistoryImportResponse(BaseModel):
+    imported: ImportCounts
+    error_count: int
+    errors: List[ImportRecordError]
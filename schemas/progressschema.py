@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List
+
+
+class DailyProgress(BaseModel):
+    day: date
+    completion_pct: float
+
+
+class WeeklyProgress(BaseModel):
+    week: int
+    week_start: date
+    completion_pct: float
+
+
+class GoalProgress(BaseModel):
+    goal_id: int
+    start_date: date
+    total_days: int
+    overall_pct: float
+    daily: List[DailyProgress]
+    weekly: List[WeeklyProgress]
+
+
+class SubGoalHeatmap(BaseModel):
+    subgoal_id: int
+    name: str
+    weight: float
+    # Base64 of a packed bitset: bit i (LSB-first within each byte) is set
+    # when the sub-goal was completed on start_date + i days.
+    bits: str
+
+
+class GoalHeatmap(BaseModel):
+    goal_id: int
+    start_date: date
+    total_days: int
+    subgoals: List[SubGoalHeatmap]
+    # Base64 of one byte per day: completed weight share scaled to 0-255.
+    intensity: str | None = None
@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Literal
+
+from schemas.goalschema import GoalResponse
+
+
+class SyncSubGoal(BaseModel):
+    id: int
+    goal_id: int
+    name: str
+    weight: float
+
+
+class SyncCompletion(BaseModel):
+    id: int
+    subgoal_id: int
+    completed_on: date
+    completed: bool
+
+
+class SyncTombstone(BaseModel):
+    entity: Literal["goal", "subgoal", "completion"]
+    id: int
+
+
+class SyncResponse(BaseModel):
+    goals: List[GoalResponse]
+    subgoals: List[SyncSubGoal]
+    completions: List[SyncCompletion]
+    deleted: List[SyncTombstone]
+    cursor: str
+    has_more: bool
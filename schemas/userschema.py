@@ -8,6 +8,8 @@ registration, validation, and authentication workflows.
 # pylint: disable=too-few-public-methods
 from pydantic import BaseModel, EmailStr, field_validator,Field
 
+from utils.timeutil import is_valid_timezone
+
 # BASE USER MODEL
 class UserBase(BaseModel):
     """
@@ -77,7 +79,35 @@ class UserResponse(BaseModel):
     id: int
     username: str
     email: str
+    timezone: str = "UTC"
 
     class Config:
         """Pydantic configuration."""
         from_attributes = True
+
+
+# TIMEZONE UPDATE SCHEMA
+class TimezoneUpdate(BaseModel):
+    """
+    Schema for changing the user's timezone.
+    """
+    timezone: str
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, v):
+        """
+        Validate that the timezone is a known IANA zone.
+
+        Args:
+            value (str): Zone name, e.g. "Europe/Berlin".
+
+        Returns:
+            str: Validated zone name.
+
+        Raises:
+            ValueError: If the zone is unknown.
+        """
+        if not is_valid_timezone(v):
+            raise ValueError("Unknown timezone")
+        return v
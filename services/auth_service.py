@@ -3,37 +3,39 @@
 from sqlalchemy.orm import Session
 import bcrypt
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from models.models import Users
 from schemas.userschema import UserCreate, UserResponse
+from utils.password_pool import password_pool
 from utils.security import create_access_token, create_refresh_token, decode_refresh_token
+from utils.user_cache import invalidate_user
 
 
 # PASSWORD HASHING UTILITIES
-def hash_password(password: str) -> str:
-    """Hash a plain-text password using bcrypt."""
+def _hash_password(password: str) -> str:
     password_bytes = password.strip().encode("utf-8")[:72]
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode("utf-8")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain-text password against a bcrypt hash."""
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
     plain_bytes = plain_password.strip().encode("utf-8")[:72]
     return bcrypt.checkpw(plain_bytes, hashed_password.encode("utf-8"))
 
 
-# USER REGISTRATION
-def register_user(db: Session, user: UserCreate) -> UserResponse:
-    """
-    Register a new user using email + password.
+async def hash_password(password: str) -> str:
+    """Hash a plain-text password using bcrypt on the password pool."""
+    return await password_pool.run(_hash_password, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain-text password against a bcrypt hash on the password pool."""
+    return await password_pool.run(_verify_password, plain_password, hashed_password)
 
-    Rules:
-    - Email must be unique
-    - Username must be unique
-    - If email already exists via SSO, block password registration
-    """
 
+# USER REGISTRATION
+def _ensure_can_register(db: Session, user: UserCreate):
     # Check email
     existing_user = (
         db.query(Users)
@@ -68,10 +70,8 @@ def register_user(db: Session, user: UserCreate) -> UserResponse:
             detail="Username already registered"
         )
 
-    # Hash password
-    hashed_password = hash_password(user.password)
 
-    # Create user
+def _create_user(db: Session, user: UserCreate, hashed_password: str) -> Users:
     db_user = Users(
         username=user.username,
         email=user.email,
@@ -85,16 +85,38 @@ def register_user(db: Session, user: UserCreate) -> UserResponse:
     return db_user
 
 
+async def register_user(db: Session, user: UserCreate) -> UserResponse:
+    """
+    Register a new user using email + password.
+
+    Rules:
+    - Email must be unique
+    - Username must be unique
+    - If email already exists via SSO, block password registration
+    """
+    await run_in_threadpool(_ensure_can_register, db, user)
+
+    # Hash password
+    hashed_password = await hash_password(user.password)
+
+    # Create user
+    return await run_in_threadpool(_create_user, db, user, hashed_password)
+
+
 
 # USER AUTHENTICATION
-def authenticate_user(db: Session, email: str, password: str):
+def _get_user_by_email(db: Session, email: str):
+    return db.query(Users).filter(Users.email == email).first()
+
+
+async def authenticate_user(db: Session, email: str, password: str):
     """Authenticate a user and return access and refresh tokens."""
-    user = db.query(Users).filter(Users.email == email).first()
+    user = await run_in_threadpool(_get_user_by_email, db, email)
 
     if (
         not user
         or not user.password_hash  # 🔒 SSO-only user
-        or not verify_password(password, user.password_hash)
+        or not await verify_password(password, user.password_hash)
     ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -120,7 +142,14 @@ def refresh_access_token(refresh_token: str):
     new_access_token = create_access_token({"user_id": payload["user_id"]})
     return {"access_token": new_access_token, "token_type": "bearer"}
 
-def set_password(db: Session, user: Users, password: str):
+def _store_password(db: Session, user: Users, hashed_password: str):
+    user.password_hash = hashed_password
+
+    db.commit()
+    invalidate_user(user.id)
+    db.refresh(user)
+
+async def set_password(db: Session, user: Users, password: str):
     """
     Allow an SSO-only user to set a password.
 
@@ -134,10 +163,7 @@ def set_password(db: Session, user: Users, password: str):
             detail="Password already set for this account"
         )
 
-    hashed_password = hash_password(password)
-    user.password_hash = hashed_password
-
-    db.commit()
-    db.refresh(user)
+    hashed_password = await hash_password(password)
+    await run_in_threadpool(_store_password, db, user, hashed_password)
 
     return {"message": "Password set successfully"}
@@ -1,47 +1,212 @@
+from collections import defaultdict
 from datetime import date
-from sqlalchemy.orm import Session
+from sqlalchemy import Date, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from fastapi import HTTPException
-from models.models import SubGoals, SubGoalDailyCompletion, Users
+from models.models import Goals, SubGoals, SubGoalDailyCompletion
+from services.goal_cache import invalidate_goal_tree
+from services.streak_service import record_completion
+from services.version_service import bump_goals_version
+from utils.events import publish_event
+from utils.timeutil import local_today
+from utils.user_cache import Principal
 
 
-def complete_subgoal(
-    db: Session,
-    user: Users,
+def _streak(goal: Goals) -> dict:
+    return {
+        "goal_id": goal.id,
+        "current_streak": goal.current_streak,
+        "longest_streak": goal.longest_streak,
+    }
+
+
+async def complete_subgoal(
+    db: AsyncSession,
+    user: Principal,
     subgoal_id: int,
     completed_on: date | None,
 ):
-    subgoal = (
-        db.query(SubGoals)
-        .join(SubGoals.goal)
-        .filter(
-            SubGoals.id == subgoal_id,
-            SubGoals.goal.has(user_id=user.id),
+    """
+    Mark a sub-goal as completed for a day.
+
+    The ownership check and the idempotent insert run as one statement:
+    an ``owned`` CTE resolves the sub-goal for this user and feeds an
+    ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` CTE. Outer-joining the
+    two tells apart "not found" (no row), "already completed" (no inserted
+    id) and a fresh completion, without a race on the unique constraint.
+    The same statement returns the goal's total sub-goal weight for the
+    streak update, so the request makes four round trips: version bump,
+    this statement, the goal lock and the rollup upsert. Extending a
+    streak run adds more. The day defaults to today in the user's
+    timezone; later days are rejected with 422.
+    """
+    today = local_today(user.timezone)
+    day = completed_on or today
+    if day > today:
+        raise HTTPException(status_code=422, detail="completed_on is in the future")
+
+    # First, so the completion's change_seq is drawn under the user lock;
+    # rolled back below if nothing is inserted.
+    await bump_goals_version(db, user.id)
+
+    owned = (
+        select(SubGoals.id, SubGoals.goal_id, SubGoals.weight)
+        .join(Goals, Goals.id == SubGoals.goal_id)
+        .where(SubGoals.id == subgoal_id, Goals.user_id == user.id)
+        .cte("owned")
+    )
+    inserted = (
+        insert(SubGoalDailyCompletion)
+        .from_select(
+            ["subgoal_id", "completed_on"],
+            select(owned.c.id, literal(day, Date)),
         )
-        .first()
+        .on_conflict_do_nothing(constraint="uix_subgoal_completed_day")
+        .returning(SubGoalDailyCompletion.subgoal_id)
+        .cte("inserted")
     )
+    # Stable until commit: sub-goal writes take the user lock bumped above.
+    siblings = aliased(SubGoals)
+    total_weight = (
+        select(func.coalesce(func.sum(siblings.weight), 0.0))
+        .where(siblings.goal_id == owned.c.goal_id)
+        .scalar_subquery()
+    )
+    row = (await db.execute(
+        select(
+            owned.c.goal_id,
+            owned.c.weight,
+            total_weight.label("total_weight"),
+            inserted.c.subgoal_id.label("inserted_id"),
+        ).select_from(
+            owned.outerjoin(inserted, inserted.c.subgoal_id == owned.c.id)
+        )
+    )).first()
 
-    if not subgoal:
+    if row is None:
+        await db.rollback()
         raise HTTPException(status_code=404, detail="Sub-goal not found")
 
-    day = completed_on or date.today()
+    if row.inserted_id is None:
+        await db.rollback()
+        return {"message": "Already completed for this day"}
 
-    existing = (
-        db.query(SubGoalDailyCompletion)
-        .filter(
-            SubGoalDailyCompletion.subgoal_id == subgoal.id,
-            SubGoalDailyCompletion.completed_on == day,
-        )
-        .first()
+    goal = await record_completion(
+        db, row.goal_id, day, row.weight, today=today, total_weight=row.total_weight
     )
+    await db.commit()
+    invalidate_goal_tree(user.id)
+    await publish_event(user.id, "subgoals.completed", {
+        "completions": [
+            {"subgoal_id": subgoal_id, "goal_id": row.goal_id, "completed_on": day}
+        ],
+        "streaks": [_streak(goal)],
+    })
+
+    return {
+        "message": "Sub-goal marked as completed",
+        "current_streak": goal.current_streak,
+        "longest_streak": goal.longest_streak,
+    }
 
-    if existing:
-        return {"message": "Already completed for this day"}
 
-    completion = SubGoalDailyCompletion(
-        subgoal_id=subgoal.id,
-        completed_on=day,
+async def complete_subgoals_batch(db: AsyncSession, user: Principal, items):
+    """
+    Mark many (sub-goal, day) pairs as completed in one transaction.
+
+    Ownership of every referenced sub-goal is checked with one query, the
+    owned pairs are written with a single multi-row
+    ``INSERT ... ON CONFLICT DO NOTHING`` and the daily rollup and streaks
+    are updated once per (goal, day) before a single commit. Days after
+    today in the user's timezone are reported as "future_day" and skipped.
+
+    Returns:
+        list[dict]: One outcome per input item, in input order.
+    """
+    today = local_today(user.timezone)
+    pairs = [(item.subgoal_id, item.completed_on or today) for item in items]
+
+    owned = {
+        row.id: row
+        for row in await db.execute(
+            select(SubGoals.id, SubGoals.goal_id, SubGoals.weight)
+            .join(Goals, Goals.id == SubGoals.goal_id)
+            .where(
+                SubGoals.id.in_({subgoal_id for subgoal_id, _ in pairs}),
+                Goals.user_id == user.id,
+            )
+        )
+    }
+
+    to_insert = sorted(
+        {(subgoal_id, day) for subgoal_id, day in pairs if subgoal_id in owned and day <= today}
     )
-    db.add(completion)
-    db.commit()
+    inserted = set()
+    if to_insert:
+        # Before the insert, so change_seqs are drawn under the user lock.
+        await bump_goals_version(db, user.id)
+        stmt = (
+            insert(SubGoalDailyCompletion)
+            .values(
+                [
+                    {"subgoal_id": subgoal_id, "completed_on": day}
+                    for subgoal_id, day in to_insert
+                ]
+            )
+            .on_conflict_do_nothing(constraint="uix_subgoal_completed_day")
+            .returning(
+                SubGoalDailyCompletion.subgoal_id,
+                SubGoalDailyCompletion.completed_on,
+            )
+        )
+        inserted = {tuple(row) for row in await db.execute(stmt)}
 
-    return {"message": "Sub-goal marked as completed"}
+    added = defaultdict(lambda: [0.0, 0])
+    for subgoal_id, day in inserted:
+        sub = owned[subgoal_id]
+        added[(sub.goal_id, day)][0] += sub.weight
+        added[(sub.goal_id, day)][1] += 1
+
+    # Sorted so concurrent batches lock goals in the same order.
+    goals = {}
+    for (goal_id, day), (weight, count) in sorted(added.items()):
+        goals[goal_id] = await record_completion(
+            db, goal_id, day, weight, count, today=today
+        )
+
+    if inserted:
+        await db.commit()
+        invalidate_goal_tree(user.id)
+        await publish_event(user.id, "subgoals.completed", {
+            "completions": [
+                {
+                    "subgoal_id": subgoal_id,
+                    "goal_id": owned[subgoal_id].goal_id,
+                    "completed_on": day,
+                }
+                for subgoal_id, day in sorted(inserted)
+            ],
+            "streaks": [_streak(goal) for goal in goals.values()],
+        })
+    else:
+        # Nothing new; drop the version bump.
+        await db.rollback()
+
+    results = []
+    reported = set()
+    for subgoal_id, day in pairs:
+        if subgoal_id not in owned:
+            outcome = "not_found"
+        elif day > today:
+            outcome = "future_day"
+        elif (subgoal_id, day) in inserted and (subgoal_id, day) not in reported:
+            outcome = "completed"
+            reported.add((subgoal_id, day))
+        else:
+            outcome = "already_completed"
+        results.append(
+            {"subgoal_id": subgoal_id, "completed_on": day, "status": outcome}
+        )
+    return results
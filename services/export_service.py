@@ -0,0 +1,130 @@
+"""
+Streaming export of a user's goal history.
+
+Goals, sub-goals and daily completions are read with one ordered query
+through a server-side cursor (`yield_per`) and encoded chunk by chunk, so
+memory use is constant regardless of how much history a user has.
+"""
+
+import csv
+import io
+import os
+from typing import AsyncIterator
+
+import orjson
+from sqlalchemy import and_, select
+
+from db import open_async_session
+from models.models import Goals, SubGoals, SubGoalDailyCompletion
+
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", 1000))
+
+CSV_COLUMNS = [
+    "goal_id",
+    "goal_title",
+    "total_days",
+    "start_date",
+    "subgoal_id",
+    "subgoal_name",
+    "weight",
+    "completed_on",
+]
+
+
+def _history_query(user_id: int):
+    return (
+        select(
+            Goals.id.label("goal_id"),
+            Goals.title,
+            Goals.total_days,
+            Goals.start_date,
+            Goals.current_streak,
+            Goals.longest_streak,
+            SubGoals.id.label("subgoal_id"),
+            SubGoals.name.label("subgoal_name"),
+            SubGoals.weight,
+            SubGoalDailyCompletion.completed_on,
+        )
+        .outerjoin(SubGoals, SubGoals.goal_id == Goals.id)
+        .outerjoin(
+            SubGoalDailyCompletion,
+            and_(
+                SubGoalDailyCompletion.subgoal_id == SubGoals.id,
+                SubGoalDailyCompletion.completed.is_(True),
+            ),
+        )
+        .where(Goals.user_id == user_id)
+        .order_by(Goals.id, SubGoals.id, SubGoalDailyCompletion.completed_on)
+        .execution_options(yield_per=EXPORT_CHUNK_ROWS)
+    )
+
+
+def _ndjson_chunk(rows, state) -> bytes:
+    out = bytearray()
+    for row in rows:
+        if row.goal_id != state.get("goal_id"):
+            state["goal_id"] = row.goal_id
+            state["subgoal_id"] = None
+            out += orjson.dumps({
+                "type": "goal",
+                "id": row.goal_id,
+                "title": row.title,
+                "total_days": row.total_days,
+                "start_date": row.start_date,
+                "current_streak": row.current_streak,
+                "longest_streak": row.longest_streak,
+            }) + b"\n"
+        if row.subgoal_id is not None and row.subgoal_id != state["subgoal_id"]:
+            state["subgoal_id"] = row.subgoal_id
+            out += orjson.dumps({
+                "type": "subgoal",
+                "id": row.subgoal_id,
+                "goal_id": row.goal_id,
+                "name": row.subgoal_name,
+                "weight": row.weight,
+            }) + b"\n"
+        if row.completed_on is not None:
+            out += orjson.dumps({
+                "type": "completion",
+                "subgoal_id": row.subgoal_id,
+                "completed_on": row.completed_on,
+            }) + b"\n"
+    return bytes(out)
+
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            row.goal_id,
+            row.title,
+            row.total_days,
+            row.start_date.isoformat(),
+            row.subgoal_id if row.subgoal_id is not None else "",
+            row.subgoal_name or "",
+            row.weight if row.weight is not None else "",
+            row.completed_on.isoformat() if row.completed_on else "",
+        ])
+    return buffer.getvalue().encode("utf-8")
+
+
+async def export_user_history(user_id: int, fmt: str = "ndjson") -> AsyncIterator[bytes]:
+    """
+    Yield the user's history encoded as NDJSON or CSV.
+
+    NDJSON emits "goal", "subgoal" and "completion" records in order;
+    CSV emits one flattened row per (goal, sub-goal, completion day).
+    The generator owns its session so it can outlive the request
+    dependencies while the response streams.
+    """
+    state = {}
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(CSV_COLUMNS)
+        yield buffer.getvalue().encode("utf-8")
+
+    async with open_async_session() as db:
+        result = await db.stream(_history_query(user_id))
+        async for rows in result.partitions():
+            yield _csv_chunk(rows) if fmt == "csv" else _ndjson_chunk(rows, state)
@@ -0,0 +1,79 @@
+"""
+Server-side cache of users' serialized goal listings.
+
+Each user has one cache entry holding up to GOAL_CACHE_MAX_VIEWS_PER_USER
+serialized listing pages ("views", keyed by request parameters), tagged
+with the goals version read before they were built. A view is only
+served when its version equals the user's current `Users.goals_version`,
+so writes made through other workers (whose `invalidate_goal_tree` only
+reaches their own process) never serve a stale body. The version is read
+before the listing is built, so a view that raced a write is tagged with
+the older version and is never served once that write has committed.
+`invalidate_goal_tree` still frees the memory right away, and entries
+expire after GOAL_CACHE_TTL_SECONDS.
+
+Memory is bounded by the number of users (LRU), views per user and
+the maximum size of a cached body. The default backend is in-process; a
+shared backend can be plugged in with `set_goal_cache_backend`.
+"""
+
+import os
+from typing import Hashable, Optional
+
+from utils.cache import CacheBackend, TTLCache
+
+GOAL_CACHE_MAX_USERS = int(os.getenv("GOAL_CACHE_MAX_USERS", 5000))
+GOAL_CACHE_MAX_VIEWS_PER_USER = int(os.getenv("GOAL_CACHE_MAX_VIEWS_PER_USER", 8))
+GOAL_CACHE_MAX_BODY_BYTES = int(os.getenv("GOAL_CACHE_MAX_BODY_BYTES", 256 * 1024))
+GOAL_CACHE_TTL_SECONDS = float(os.getenv("GOAL_CACHE_TTL_SECONDS", 60))
+
+_backend: CacheBackend = TTLCache(GOAL_CACHE_MAX_USERS, GOAL_CACHE_TTL_SECONDS)
+
+
+def set_goal_cache_backend(backend: CacheBackend) -> None:
+    """Replace the goal cache backend (e.g. with a shared store)."""
+    global _backend  # pylint: disable=global-statement
+    _backend = backend
+
+
+def get_goal_cache_backend() -> CacheBackend:
+    """Return the active goal cache backend."""
+    return _backend
+
+
+def _key(user_id: int) -> str:
+    return f"goals:{user_id}"
+
+
+def get_goal_tree_view(user_id: int, view: Hashable, version: int) -> Optional[bytes]:
+    """
+    Return the cached body of a user's view if it was built from `version`.
+
+    Args:
+        version (int): The user's current goals version, read from the DB.
+    """
+    views = _backend.get(_key(user_id))
+    if not views:
+        return None
+    cached = views.get(view)
+    if cached is None or cached[0] != version:
+        return None
+    return cached[1]
+
+
+def store_goal_tree_view(user_id: int, view: Hashable, version: int, body: bytes) -> None:
+    """Cache a serialized view built from `version` of the user's goals."""
+    if len(body) > GOAL_CACHE_MAX_BODY_BYTES:
+        return
+    # Copy rather than mutate so shared backends see a consistent value.
+    views = dict(_backend.get(_key(user_id)) or {})
+    views.pop(view, None)
+    views[view] = (version, body)
+    while len(views) > GOAL_CACHE_MAX_VIEWS_PER_USER:
+        del views[next(iter(views))]
+    _backend.set(_key(user_id), views)
+
+
+def invalidate_goal_tree(user_id: int) -> None:
+    """Drop every cached view of the user's goals."""
+    _backend.delete(_key(user_id))
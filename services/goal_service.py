@@ -1,9 +1,20 @@
-from sqlalchemy.orm import Session
+from datetime import date, datetime
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from models.models import Goals, SubGoals, Users
+from models.models import Goals, SubGoals
 from sqlalchemy.exc import IntegrityError
+from services.goal_cache import invalidate_goal_tree
+from services.version_service import bump_goals_version
+from utils.events import publish_event
+from utils.cursor import decode_cursor, encode_cursor
+from utils.timeutil import local_today
+from utils.user_cache import Principal
 
-def create_goal(db: Session, user: Users, payload):
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+async def create_goal(db: AsyncSession, user: Principal, payload):
     goal = Goals(
         user_id=user.id,
         title=payload.title,
@@ -11,17 +22,29 @@ def create_goal(db: Session, user: Users, payload):
         start_date=payload.start_date,
     )
     db.add(goal)
-    db.commit()
-    db.refresh(goal)
+    await bump_goals_version(db, user.id)
+    await db.commit()
+    invalidate_goal_tree(user.id)
+    await db.refresh(goal)
+    await publish_event(user.id, "goal.created", {
+        "goal": {
+            "id": goal.id,
+            "title": goal.title,
+            "total_days": goal.total_days,
+            "start_date": goal.start_date,
+            "current_streak": goal.current_streak,
+            "longest_streak": goal.longest_streak,
+        },
+    })
     return goal
 
 
-def create_subgoal(db: Session, user: Users, goal_id: int, payload):
+async def create_subgoal(db: AsyncSession, user: Principal, goal_id: int, payload):
     goal = (
-        db.query(Goals)
-        .filter(Goals.id == goal_id, Goals.user_id == user.id)
-        .first()
-    )
+        await db.scalars(
+            select(Goals).where(Goals.id == goal_id, Goals.user_id == user.id)
+        )
+    ).first()
 
     if not goal:
         raise HTTPException(
@@ -36,23 +59,145 @@ def create_subgoal(db: Session, user: Users, goal_id: int, payload):
     )
 
     db.add(subgoal)
+    await bump_goals_version(db, user.id)
 
     try:
-        db.commit()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Sub-goal with this name already exists for this goal"
         )
 
-    db.refresh(subgoal)
+    invalidate_goal_tree(user.id)
+    await db.refresh(subgoal)
+    await publish_event(user.id, "subgoal.created", {
+        "goal_id": subgoal.goal_id,
+        "subgoal": {
+            "id": subgoal.id,
+            "name": subgoal.name,
+            "weight": subgoal.weight,
+        },
+    })
     return subgoal
 
 
-def get_user_goals(db: Session, user: Users):
-    return (
-        db.query(Goals)
-        .filter(Goals.user_id == user.id)
-        .all()
+def _decode_goal_cursor(cursor: str):
+    payload = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+async def get_user_goals(
+    db: AsyncSession,
+    user: Principal,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    goal_status: str | None = None,
+    start_from: date | None = None,
+    start_to: date | None = None,
+):
+    """
+    Return one page of the user's goals with their sub-goals nested.
+
+    Goals are keyset-paginated on (created_at, id). The page of goals is
+    selected in a subquery and outer-joined to its sub-goals, so each page
+    is one round trip of plain columns folded into dicts in a single pass,
+    and its cost does not grow with the number of goals the account has.
+
+    Args:
+        cursor (str | None): `next_cursor` from the previous page.
+        limit (int): Page size, clamped to MAX_PAGE_SIZE.
+        goal_status (str | None): "active" or "finished".
+        start_from (date | None): Inclusive lower bound on start_date.
+        start_to (date | None): Inclusive upper bound on start_date.
+
+    Returns:
+        dict: {"items": [...], "next_cursor": str | None}
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    today = local_today(user.timezone)
+    end_date = Goals.start_date + Goals.total_days
+
+    page = (
+        select(
+            Goals.id,
+            Goals.title,
+            Goals.total_days,
+            Goals.start_date,
+            Goals.current_streak,
+            Goals.longest_streak,
+            Goals.created_at,
+        )
+        .where(Goals.user_id == user.id)
+    )
+    if cursor:
+        created_at, goal_id = _decode_goal_cursor(cursor)
+        page = page.where(
+            tuple_(Goals.created_at, Goals.id) > tuple_(created_at, goal_id)
+        )
+    if goal_status == "active":
+        page = page.where(Goals.start_date <= today, end_date > today)
+    elif goal_status == "finished":
+        page = page.where(end_date <= today)
+    if start_from:
+        page = page.where(Goals.start_date >= start_from)
+    if start_to:
+        page = page.where(Goals.start_date <= start_to)
+
+    # Fetch one extra goal to know whether another page exists.
+    page = (
+        page.order_by(Goals.created_at, Goals.id)
+        .limit(limit + 1)
+        .subquery()
+    )
+
+    rows = await db.execute(
+        select(
+            page,
+            SubGoals.id.label("subgoal_id"),
+            SubGoals.name.label("subgoal_name"),
+            SubGoals.weight.label("subgoal_weight"),
+        )
+        .outerjoin(SubGoals, SubGoals.goal_id == page.c.id)
+        .order_by(page.c.created_at, page.c.id, SubGoals.id)
+    )
+
+    goals = []
+    current = None
+    for row in rows:
+        if current is None or current["id"] != row.id:
+            if len(goals) == limit:
+                break
+            current = {
+                "id": row.id,
+                "title": row.title,
+                "total_days": row.total_days,
+                "start_date": row.start_date,
+                "current_streak": row.current_streak,
+                "longest_streak": row.longest_streak,
+                "subgoals": [],
+            }
+            goals.append(current)
+            last_key = (row.created_at, row.id)
+        if row.subgoal_id is not None:
+            current["subgoals"].append(
+                {
+                    "id": row.subgoal_id,
+                    "name": row.subgoal_name,
+                    "weight": row.subgoal_weight,
+                }
+            )
+    else:
+        return {"items": goals, "next_cursor": None}
+
+    next_cursor = encode_cursor(
+        {"c": last_key[0].isoformat(), "i": last_key[1]}
     )
+    return {"items": goals, "next_cursor": next_cursor}
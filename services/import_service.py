@@ -0,0 +1,361 @@
+"""
+Streaming bulk import of goal history.
+
+Accepts the same NDJSON and CSV formats produced by `export_service`, so an
+export can be loaded back into another account. Records are validated with
+`GoalCreate` / `SubGoalCreate` and buffered; every `IMPORT_CHUNK_RECORDS`
+records are written with multi-row inserts and committed, so a large upload
+never holds one long transaction. Ids in the payload are only references
+between records; new ids are assigned on insert. Streaks and the daily
+rollup are recomputed once per imported goal at the end.
+"""
+
+import csv
+import io
+import os
+from datetime import date
+from typing import AsyncIterator
+
+import orjson
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import Goals, SubGoals, SubGoalDailyCompletion
+from schemas.goalschema import GoalCreate, SubGoalCreate
+from services.export_service import CSV_COLUMNS
+from services.goal_cache import invalidate_goal_tree
+from services.rollup_service import rebuild_daily_progress
+from services.streak_service import rebuild_goal_streaks
+from services.version_service import bump_goals_version
+from utils.events import publish_event
+from utils.timeutil import local_today
+from utils.user_cache import Principal
+
+IMPORT_CHUNK_RECORDS = int(os.getenv("IMPORT_CHUNK_RECORDS", 1000))
+IMPORT_REBUILD_GOALS = int(os.getenv("IMPORT_REBUILD_GOALS", 500))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", 100))
+
+_date = TypeAdapter(date)
+
+
+class _RecordError(ValueError):
+    pass
+
+
+async def _lines(stream: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+    """Split a byte stream into numbered lines."""
+    buffer = b""
+    number = 0
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            number += 1
+            yield number, line.rstrip(b"\r")
+    if buffer:
+        yield number + 1, buffer.rstrip(b"\r")
+
+
+def _ref(value) -> str:
+    if value is None or value == "":
+        raise _RecordError("missing id reference")
+    return str(value)
+
+
+def _validate(schema, data):
+    try:
+        return schema.model_validate(data)
+    except ValidationError as exc:
+        first = exc.errors()[0]
+        field = ".".join(str(part) for part in first["loc"]) or "record"
+        raise _RecordError(f"{field}: {first['msg']}") from None
+
+
+def _parse_day(value) -> date:
+    try:
+        return _date.validate_python(value)
+    except ValidationError:
+        raise _RecordError(f"completed_on: invalid date {value!r}") from None
+
+
+async def _csv_records(stream: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+    """
+    Group lines into CSV records, numbered by their first line.
+
+    A quoted field may contain newlines, so a record ends only once its
+    quotes are balanced (escaped quotes come in pairs and keep the count
+    even). The quote byte never occurs inside a multi-byte UTF-8 sequence.
+    """
+    record = []
+    start = quotes = 0
+    async for number, line in _lines(stream):
+        if not record:
+            start = number
+        record.append(line)
+        quotes += line.count(b'"')
+        if quotes % 2 == 0:
+            yield start, b"\n".join(record)
+            record, quotes = [], 0
+    if record:
+        yield start, b"\n".join(record)
+
+
+def _csv_values(record: bytes) -> list[str]:
+    return next(csv.reader(io.StringIO(record.decode("utf-8"))), [])
+
+
+def _csv_header(record: bytes) -> list[str]:
+    header = _csv_values(record)
+    missing = set(CSV_COLUMNS) - set(header)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Missing CSV columns: {', '.join(sorted(missing))}",
+        )
+    return header
+
+
+class HistoryImport:
+    """Accumulates validated records and writes them in bounded chunks."""
+
+    def __init__(self, db: AsyncSession, user: Principal):
+        self.db = db
+        self.user = user
+        self.today = local_today(user.timezone)
+        # Payload reference -> new id (None while the row is still buffered).
+        self.goal_ids: dict[str, int | None] = {}
+        self.subgoal_ids: dict[str, int | None] = {}
+        self.subgoal_goal: dict[str, str] = {}
+        self.subgoal_names: set[tuple[str, str]] = set()
+        self.pending_goals: list[tuple[str, GoalCreate]] = []
+        self.pending_subgoals: list[tuple[str, SubGoalCreate]] = []
+        self.pending_completions: set[tuple[str, date]] = set()
+        self.imported_goal_ids: list[int] = []
+        self.counts = {"goals": 0, "subgoals": 0, "completions": 0}
+        self.errors: list[dict] = []
+        self.error_count = 0
+
+    @property
+    def pending(self) -> int:
+        return (
+            len(self.pending_goals)
+            + len(self.pending_subgoals)
+            + len(self.pending_completions)
+        )
+
+    def error(self, line: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def add_goal(self, ref, data: dict):
+        ref = _ref(ref)
+        if ref in self.goal_ids:
+            raise _RecordError(f"duplicate goal id {ref}")
+        payload = _validate(GoalCreate, data)
+        self.goal_ids[ref] = None
+        self.pending_goals.append((ref, payload))
+
+    def add_subgoal(self, ref, goal_ref, data: dict):
+        ref, goal_ref = _ref(ref), _ref(goal_ref)
+        if goal_ref not in self.goal_ids:
+            raise _RecordError(f"unknown goal id {goal_ref}")
+        if ref in self.subgoal_ids:
+            raise _RecordError(f"duplicate subgoal id {ref}")
+        payload = _validate(SubGoalCreate, data)
+        if (goal_ref, payload.name) in self.subgoal_names:
+            raise _RecordError(f"duplicate sub-goal name {payload.name!r}")
+        self.subgoal_names.add((goal_ref, payload.name))
+        self.subgoal_ids[ref] = None
+        self.subgoal_goal[ref] = goal_ref
+        self.pending_subgoals.append((ref, payload))
+
+    def add_completion(self, subgoal_ref, completed_on):
+        subgoal_ref = _ref(subgoal_ref)
+        if subgoal_ref not in self.subgoal_ids:
+            raise _RecordError(f"unknown subgoal id {subgoal_ref}")
+        day = _parse_day(completed_on)
+        if day > self.today:
+            raise _RecordError(f"completed_on: {day} is in the future")
+        self.pending_completions.add((subgoal_ref, day))
+
+    def add_ndjson(self, line: bytes):
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            raise _RecordError("invalid JSON") from None
+        if not isinstance(record, dict):
+            raise _RecordError("record must be a JSON object")
+
+        kind = record.get("type")
+        if kind == "goal":
+            self.add_goal(record.get("id"), {
+                "title": record.get("title"),
+                "total_days": record.get("total_days"),
+                "start_date": record.get("start_date"),
+            })
+        elif kind == "subgoal":
+            self.add_subgoal(record.get("id"), record.get("goal_id"), {
+                "name": record.get("name"),
+                "weight": record.get("weight", 1.0),
+            })
+        elif kind == "completion":
+            self.add_completion(record.get("subgoal_id"), record.get("completed_on"))
+        else:
+            raise _RecordError(f"unknown record type {kind!r}")
+
+    def add_csv(self, row: dict):
+        goal_ref = _ref(row.get("goal_id"))
+        if goal_ref not in self.goal_ids:
+            self.add_goal(goal_ref, {
+                "title": row.get("goal_title"),
+                "total_days": row.get("total_days"),
+                "start_date": row.get("start_date"),
+            })
+        subgoal_ref = row.get("subgoal_id")
+        if not subgoal_ref:
+            return
+        if subgoal_ref not in self.subgoal_ids:
+            self.add_subgoal(subgoal_ref, goal_ref, {
+                "name": row.get("subgoal_name"),
+                "weight": row.get("weight") or 1.0,
+            })
+        elif self.subgoal_goal[subgoal_ref] != goal_ref:
+            raise _RecordError(f"subgoal id {subgoal_ref} belongs to another goal")
+        if row.get("completed_on"):
+            self.add_completion(subgoal_ref, row["completed_on"])
+
+    async def flush(self):
+        """Write buffered records in one transaction."""
+        if not self.pending:
+            return
+
+        await bump_goals_version(self.db, self.user.id)
+        if self.pending_goals:
+            ids = (await self.db.scalars(
+                insert(Goals).returning(Goals.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "user_id": self.user.id,
+                        "title": payload.title,
+                        "total_days": payload.total_days,
+                        "start_date": payload.start_date,
+                    }
+                    for _, payload in self.pending_goals
+                ],
+            )).all()
+            for (ref, _), goal_id in zip(self.pending_goals, ids):
+                self.goal_ids[ref] = goal_id
+            self.imported_goal_ids.extend(ids)
+
+        if self.pending_subgoals:
+            ids = (await self.db.scalars(
+                insert(SubGoals).returning(SubGoals.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "goal_id": self.goal_ids[self.subgoal_goal[ref]],
+                        "name": payload.name,
+                        "weight": payload.weight,
+                    }
+                    for ref, payload in self.pending_subgoals
+                ],
+            )).all()
+            for (ref, _), subgoal_id in zip(self.pending_subgoals, ids):
+                self.subgoal_ids[ref] = subgoal_id
+
+        completed = 0
+        if self.pending_completions:
+            result = await self.db.execute(
+                pg_insert(SubGoalDailyCompletion)
+                .values([
+                    {"subgoal_id": self.subgoal_ids[ref], "completed_on": day}
+                    for ref, day in sorted(self.pending_completions)
+                ])
+                .on_conflict_do_nothing(constraint="uix_subgoal_completed_day")
+            )
+            completed = result.rowcount
+
+        await self.db.commit()
+        self.counts["goals"] += len(self.pending_goals)
+        self.counts["subgoals"] += len(self.pending_subgoals)
+        self.counts["completions"] += completed
+        self.pending_goals.clear()
+        self.pending_subgoals.clear()
+        self.pending_completions.clear()
+
+    async def finish(self):
+        """Flush the tail and recompute rollups and streaks for new goals."""
+        await self.flush()
+        if not self.imported_goal_ids:
+            return
+
+        for start in range(0, len(self.imported_goal_ids), IMPORT_REBUILD_GOALS):
+            batch = self.imported_goal_ids[start:start + IMPORT_REBUILD_GOALS]
+            await bump_goals_version(self.db, self.user.id)
+            await rebuild_daily_progress(self.db, batch)
+            await rebuild_goal_streaks(self.db, batch, today=self.today)
+            await self.db.commit()
+
+        invalidate_goal_tree(self.user.id)
+        await publish_event(self.user.id, "goals.changed", {
+            "imported_goals": len(self.imported_goal_ids),
+        })
+
+    def summary(self) -> dict:
+        return {
+            "imported": dict(self.counts),
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+async def import_user_history(
+    db: AsyncSession,
+    user: Principal,
+    stream: AsyncIterator[bytes],
+    fmt: str = "ndjson",
+) -> dict:
+    """
+    Import goals, sub-goals and completions from an NDJSON or CSV stream.
+
+    Invalid records are skipped and reported with their (first) line
+    number; records
+    referencing a goal or sub-goal must come after it. Chunks committed
+    before a failure stay imported.
+
+    Returns:
+        dict: Imported counts and the first `IMPORT_MAX_ERRORS` errors.
+    """
+    job = HistoryImport(db, user)
+    header = None
+
+    records = _csv_records(stream) if fmt == "csv" else _lines(stream)
+
+    try:
+        async for number, record in records:
+            if not record.strip():
+                continue
+            try:
+                if fmt == "ndjson":
+                    job.add_ndjson(record)
+                elif header is None:
+                    header = _csv_header(record)
+                else:
+                    job.add_csv(dict(zip(header, _csv_values(record))))
+            except UnicodeDecodeError:
+                job.error(number, "invalid UTF-8")
+            except _RecordError as exc:
+                job.error(number, str(exc))
+
+            if job.pending >= IMPORT_CHUNK_RECORDS:
+                await job.flush()
+
+        await job.finish()
+    except Exception:
+        await db.rollback()
+        raise
+
+    return job.summary()
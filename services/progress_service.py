@@ -0,0 +1,224 @@
+import base64
+from datetime import timedelta
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from models.models import Goals, GoalDailyProgress, SubGoals, SubGoalDailyCompletion
+from utils.user_cache import Principal
+
+
+def _pct(done_weight, total_weight, days):
+    if not total_weight or not days:
+        return 0.0
+    return round(100.0 * (done_weight or 0.0) / (total_weight * days), 2)
+
+
+async def get_goals_progress(
+    db: AsyncSession,
+    user: Principal,
+    goal_id: int | None = None,
+):
+    """
+    Return weighted completion progress for the user's goals.
+
+    A day's progress is the summed weight of the sub-goals completed that
+    day over the goal's total sub-goal weight. Daily sums are read from the
+    `goal_daily_progress` rollup (a range scan of at most `total_days` rows
+    per goal) and the weekly and overall totals come from window functions
+    over them, so each request is one aggregate query. Only days inside the
+    goal window (start_date .. start_date + total_days) count. Days and
+    weeks without any completion are omitted (0%).
+    """
+    total_weight = (
+        select(
+            SubGoals.goal_id,
+            func.sum(SubGoals.weight).label("total_weight"),
+        )
+        .join(Goals, Goals.id == SubGoals.goal_id)
+        .where(Goals.user_id == user.id)
+        .group_by(SubGoals.goal_id)
+        .subquery()
+    )
+    daily = (
+        select(
+            GoalDailyProgress.goal_id,
+            GoalDailyProgress.day,
+            GoalDailyProgress.done_weight,
+        )
+        .join(Goals, Goals.id == GoalDailyProgress.goal_id)
+        .where(
+            Goals.user_id == user.id,
+            GoalDailyProgress.day >= Goals.start_date,
+            GoalDailyProgress.day < Goals.start_date + Goals.total_days,
+        )
+        .subquery()
+    )
+    week = (daily.c.day - Goals.start_date) // 7
+
+    stmt = (
+        select(
+            Goals.id,
+            Goals.start_date,
+            Goals.total_days,
+            total_weight.c.total_weight,
+            daily.c.day,
+            daily.c.done_weight,
+            week.label("week"),
+            func.sum(daily.c.done_weight)
+            .over(partition_by=(Goals.id, week))
+            .label("week_weight"),
+            func.sum(daily.c.done_weight)
+            .over(partition_by=Goals.id)
+            .label("goal_weight"),
+        )
+        .outerjoin(total_weight, total_weight.c.goal_id == Goals.id)
+        .outerjoin(daily, daily.c.goal_id == Goals.id)
+        .where(Goals.user_id == user.id)
+        .order_by(Goals.id, daily.c.day)
+    )
+    if goal_id is not None:
+        stmt = stmt.where(Goals.id == goal_id)
+
+    goals = []
+    current = None
+    for row in await db.execute(stmt):
+        if current is None or current["goal_id"] != row.id:
+            current = {
+                "goal_id": row.id,
+                "start_date": row.start_date,
+                "total_days": row.total_days,
+                "overall_pct": _pct(row.goal_weight, row.total_weight, row.total_days),
+                "daily": [],
+                "weekly": [],
+            }
+            goals.append(current)
+        if row.day is None:
+            continue
+
+        current["daily"].append(
+            {"day": row.day, "completion_pct": _pct(row.done_weight, row.total_weight, 1)}
+        )
+        weekly = current["weekly"]
+        if not weekly or weekly[-1]["week"] != row.week:
+            days_in_week = min(7, row.total_days - row.week * 7)
+            weekly.append(
+                {
+                    "week": row.week,
+                    "week_start": row.start_date + timedelta(days=row.week * 7),
+                    "completion_pct": _pct(row.week_weight, row.total_weight, days_in_week),
+                }
+            )
+    return goals
+
+
+async def get_goal_progress(db: AsyncSession, user: Principal, goal_id: int):
+    """Return progress for a single goal owned by the user."""
+    goals = await get_goals_progress(db, user, goal_id=goal_id)
+    if not goals:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Goal not found"
+        )
+    return goals[0]
+
+
+def _b64(data) -> str:
+    return base64.b64encode(bytes(data)).decode("ascii")
+
+
+async def get_goal_heatmap(
+    db: AsyncSession,
+    user: Principal,
+    goal_id: int,
+    intensity: bool = False,
+):
+    """
+    Return a goal's completion calendar as packed bitsets.
+
+    Each sub-goal gets one bit per day of the goal window
+    (start_date .. start_date + total_days). Only (subgoal_id, completed_on)
+    pairs are fetched, never full completion rows. With `intensity`, the
+    weighted daily share from the `goal_daily_progress` rollup is added as
+    one byte per day (0-255).
+    """
+    rows = (
+        await db.execute(
+            select(
+                Goals.start_date,
+                Goals.total_days,
+                SubGoals.id.label("subgoal_id"),
+                SubGoals.name,
+                SubGoals.weight,
+            )
+            .outerjoin(SubGoals, SubGoals.goal_id == Goals.id)
+            .where(Goals.id == goal_id, Goals.user_id == user.id)
+            .order_by(SubGoals.id)
+        )
+    ).all()
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Goal not found"
+        )
+
+    start_date, total_days = rows[0].start_date, rows[0].total_days
+    end_date = start_date + timedelta(days=total_days)
+    size = (total_days + 7) // 8
+    bitsets = {
+        row.subgoal_id: bytearray(size)
+        for row in rows
+        if row.subgoal_id is not None
+    }
+
+    completions = await db.execute(
+        select(SubGoalDailyCompletion.subgoal_id, SubGoalDailyCompletion.completed_on)
+        .join(SubGoals, SubGoals.id == SubGoalDailyCompletion.subgoal_id)
+        .where(
+            SubGoals.goal_id == goal_id,
+            SubGoalDailyCompletion.completed.is_(True),
+            SubGoalDailyCompletion.completed_on >= start_date,
+            SubGoalDailyCompletion.completed_on < end_date,
+        )
+    )
+    for subgoal_id, completed_on in completions:
+        bits = bitsets.get(subgoal_id)
+        if bits is None:
+            # Sub-goal added after the first read; it is not in this heatmap.
+            continue
+        offset = (completed_on - start_date).days
+        bits[offset >> 3] |= 1 << (offset & 7)
+
+    heatmap = {
+        "goal_id": goal_id,
+        "start_date": start_date,
+        "total_days": total_days,
+        "subgoals": [
+            {
+                "subgoal_id": row.subgoal_id,
+                "name": row.name,
+                "weight": row.weight,
+                "bits": _b64(bitsets[row.subgoal_id]),
+            }
+            for row in rows
+            if row.subgoal_id is not None
+        ],
+    }
+
+    if intensity:
+        total_weight = sum(row.weight for row in rows if row.subgoal_id is not None)
+        levels = bytearray(total_days)
+        if total_weight:
+            days = await db.execute(
+                select(GoalDailyProgress.day, GoalDailyProgress.done_weight)
+                .where(
+                    GoalDailyProgress.goal_id == goal_id,
+                    GoalDailyProgress.day >= start_date,
+                    GoalDailyProgress.day < end_date,
+                )
+            )
+            for day, done_weight in days:
+                share = min(done_weight / total_weight, 1.0)
+                levels[(day - start_date).days] = round(255 * share)
+        heatmap["intensity"] = _b64(levels)
+
+    return heatmap
@@ -0,0 +1,220 @@
+"""
+Nightly streak reconciliation.
+
+Streaks are only extended when a completion is recorded, so a day without
+one never resets `current_streak` by itself. `reconcile_streaks` walks the
+goals in keyset-paginated id ranges and, per range, zeroes the current
+streak of every goal whose last qualifying day is before the owner's local
+yesterday. Per local day, one query finds the owners of stale goals, their
+goals versions are bumped (which locks their user rows) and one bulk
+``UPDATE`` limited to those owners resets the goals. Users'
+timezones are grouped by UTC offset up front, since zones sharing an
+offset share a day boundary. Ranges are processed concurrently on separate
+sessions; each range is its own transaction and also bumps the goals
+version of the affected users.
+
+Run it from cron with ``python cli.py reconcile-streaks`` or enable the
+in-process scheduler (`STREAK_RECONCILE_ENABLED`) on a single instance.
+The scheduler runs hourly and only handles zones whose day just started.
+"""
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+
+from db import open_async_session
+from models.models import Goals, Users
+from services.goal_cache import invalidate_goal_tree
+from services.streak_service import ONE_DAY
+from services.version_service import bump_goals_versions
+from utils.timeutil import group_zones_by_utc_offset
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_CHUNK_GOALS = int(os.getenv("RECONCILE_CHUNK_GOALS", 5000))
+RECONCILE_WORKERS = int(os.getenv("RECONCILE_WORKERS", 4))
+STREAK_RECONCILE_ENABLED = os.getenv("STREAK_RECONCILE_ENABLED", "false").lower() in ("1", "true", "yes")
+STREAK_RECONCILE_MINUTE = int(os.getenv("STREAK_RECONCILE_MINUTE", 5))
+
+ONE_HOUR = timedelta(hours=1)
+
+
+async def _zones_by_local_day(
+    now: datetime,
+    day_started_within: timedelta | None,
+) -> dict[date, list[str]]:
+    """Map each local day at `now` to the users' zones currently on it."""
+    async with open_async_session() as db:
+        zones = (await db.scalars(select(Users.timezone).distinct())).all()
+
+    by_day = defaultdict(list)
+    for offset, names in group_zones_by_utc_offset(zones, now).items():
+        local = now.replace(tzinfo=None) + offset
+        since_midnight = local - datetime.combine(local.date(), datetime.min.time())
+        if day_started_within is None or since_midnight < day_started_within:
+            by_day[local.date()].extend(names)
+    return dict(by_day)
+
+
+async def _goal_id_ranges(chunk_size: int):
+    """Yield (after_id, last_id] ranges of at most `chunk_size` goals."""
+    async with open_async_session() as db:
+        after = 0
+        while True:
+            upper = await db.scalar(
+                select(Goals.id)
+                .where(Goals.id > after)
+                .order_by(Goals.id)
+                .offset(chunk_size - 1)
+                .limit(1)
+            )
+            if upper is None:
+                upper = await db.scalar(select(func.max(Goals.id)).where(Goals.id > after))
+            # End the read transaction so the walk never pins a snapshot.
+            await db.rollback()
+            if upper is None:
+                return
+            yield after, upper
+            after = upper
+
+
+async def _reconcile_range(
+    after: int,
+    last: int,
+    zones_by_day: dict[date, list[str]],
+) -> set[int]:
+    """Break stale streaks for goals with ids in (after, last]."""
+    user_ids = set()
+    async with open_async_session() as db:
+        for today, zones in zones_by_day.items():
+            stale = (
+                Goals.id > after,
+                Goals.id <= last,
+                Goals.current_streak > 0,
+                Goals.last_streak_day < today - ONE_DAY,
+                Goals.user_id == Users.id,
+                Users.timezone.in_(zones),
+            )
+            owners = set(await db.scalars(select(Goals.user_id).where(*stale).distinct()))
+            if not owners:
+                continue
+            # Lock and bump the owners before touching their goals, like
+            # every other writer, so change sequences commit in order. Goals
+            # that went stale after the owners query belong to users that
+            # were not bumped; they are left for the next run.
+            await bump_goals_versions(db, owners - user_ids)
+            user_ids |= owners
+            await db.execute(
+                update(Goals)
+                .where(*stale, Goals.user_id.in_(owners))
+                .values(current_streak=0)
+            )
+        await db.commit()
+
+    for user_id in user_ids:
+        invalidate_goal_tree(user_id)
+    return user_ids
+
+
+async def reconcile_streaks(
+    now: datetime | None = None,
+    day_started_within: timedelta | None = None,
+    chunk_size: int = RECONCILE_CHUNK_GOALS,
+    workers: int = RECONCILE_WORKERS,
+) -> dict:
+    """
+    Reset `current_streak` for goals whose streak ended before the owner's
+    local yesterday.
+
+    Args:
+        now (datetime | None): Aware reference instant; defaults to now.
+        day_started_within (timedelta | None): Only handle zones whose local
+            day started less than this long before `now`; all zones if None.
+        chunk_size (int): Goals per id range and transaction.
+        workers (int): Ranges processed concurrently. Keep this below the
+            async pool size; the range walk holds one more connection.
+
+    Returns:
+        dict: Number of ranges processed and of affected users.
+    """
+    now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    zones_by_day = await _zones_by_local_day(now, day_started_within)
+    if not zones_by_day:
+        return {"chunks": 0, "users": 0}
+
+    slots = asyncio.Semaphore(workers)
+    tasks = []
+
+    async def run(after: int, last: int) -> set[int]:
+        try:
+            return await _reconcile_range(after, last, zones_by_day)
+        finally:
+            slots.release()
+
+    try:
+        async for after, last in _goal_id_ranges(chunk_size):
+            await slots.acquire()
+            tasks.append(asyncio.create_task(run(after, last)))
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    users = set().union(*results)
+    return {"chunks": len(tasks), "users": len(users)}
+
+
+class StreakReconciler:
+    """
+    Runs `reconcile_streaks` every hour at `minute` past (UTC).
+
+    Each run handles the zones whose local day started within the last
+    hour, so every zone is reconciled once a day shortly after its midnight.
+    """
+
+    def __init__(self, minute: int = STREAK_RECONCILE_MINUTE):
+        self.minute = minute
+        self._task: asyncio.Task | None = None
+
+    def _next_run(self) -> datetime:
+        now = datetime.now(timezone.utc)
+        run_at = now.replace(minute=self.minute, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += ONE_HOUR
+        return run_at
+
+    async def _loop(self) -> None:
+        while True:
+            run_at = self._next_run()
+            await asyncio.sleep((run_at - datetime.now(timezone.utc)).total_seconds())
+            try:
+                # The scheduled instant, not the wake-up time, picks the
+                # zones, so a late wake-up never skips a day boundary.
+                stats = await reconcile_streaks(run_at, day_started_within=ONE_HOUR)
+                logger.info("Streak reconciliation finished: %s", stats)
+            except Exception:
+                logger.exception("Streak reconciliation failed")
+
+    def start(self) -> None:
+        """Schedule the daily run on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Cancel the scheduled run."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+streak_reconciler = StreakReconciler()
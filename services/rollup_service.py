@@ -0,0 +1,94 @@
+"""
+Maintenance of the `goal_daily_progress` rollup.
+
+The rollup holds, per (goal, day), the summed weight and number of
+completed sub-goals. It is updated in the same transaction as every
+completion insert and can be rebuilt from `subgoal_daily_completion`.
+"""
+
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import GoalDailyProgress, Goals, SubGoals, SubGoalDailyCompletion
+
+
+async def add_daily_progress(
+    db: AsyncSession,
+    goal_id: int,
+    day: date,
+    added_weight: float,
+    added_count: int = 1,
+) -> float:
+    """
+    Add newly completed sub-goals to the rollup row for (goal, day).
+
+    Returns:
+        float: The day's summed completed weight after the update.
+    """
+    stmt = insert(GoalDailyProgress).values(
+        goal_id=goal_id,
+        day=day,
+        done_weight=added_weight,
+        completed_count=added_count,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[GoalDailyProgress.goal_id, GoalDailyProgress.day],
+        set_={
+            "done_weight": GoalDailyProgress.done_weight + stmt.excluded.done_weight,
+            "completed_count": (
+                GoalDailyProgress.completed_count + stmt.excluded.completed_count
+            ),
+        },
+    ).returning(GoalDailyProgress.done_weight)
+    return await db.scalar(stmt)
+
+
+async def rebuild_daily_progress(
+    db: AsyncSession,
+    goal_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    Recompute rollup rows from the raw completions.
+
+    The goal rows are locked first, in id order, as `record_completion`
+    does. A rebuild therefore waits for in-flight completions to commit,
+    and reads them, instead of racing their rollup upserts.
+
+    Args:
+        goal_ids (Iterable[int] | None): Goals to rebuild; all goals if None.
+
+    Returns:
+        int: Number of rollup rows written. The caller commits.
+    """
+    lock = select(Goals.id).order_by(Goals.id).with_for_update()
+    clear = delete(GoalDailyProgress)
+    source = (
+        select(
+            SubGoals.goal_id,
+            SubGoalDailyCompletion.completed_on,
+            func.sum(SubGoals.weight),
+            func.count(),
+        )
+        .join(SubGoalDailyCompletion, SubGoalDailyCompletion.subgoal_id == SubGoals.id)
+        .where(SubGoalDailyCompletion.completed.is_(True))
+        .group_by(SubGoals.goal_id, SubGoalDailyCompletion.completed_on)
+    )
+    if goal_ids is not None:
+        goal_ids = list(goal_ids)
+        lock = lock.where(Goals.id.in_(goal_ids))
+        clear = clear.where(GoalDailyProgress.goal_id.in_(goal_ids))
+        source = source.where(SubGoals.goal_id.in_(goal_ids))
+
+    await db.execute(lock)
+    await db.execute(clear)
+    result = await db.execute(
+        insert(GoalDailyProgress).from_select(
+            ["goal_id", "day", "done_weight", "completed_count"],
+            source,
+        )
+    )
+    return result.rowcount
@@ -1,54 +1,96 @@
 import os
 import httpx
 from jose import jwt
-from sqlalchemy.orm import Session
+from jose.exceptions import JOSEError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.models import Users, UserAuthProviders
+from utils.http_client import get_http_client
+from utils.jwks import JWKSCache
 from utils.security import create_access_token, create_refresh_token
 from fastapi import HTTPException
 
-GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+# Endpoints are overridable so the flow can run against a local stub.
+GOOGLE_TOKEN_URL = os.getenv("GOOGLE_TOKEN_URL", "https://oauth2.googleapis.com/token")
+GOOGLE_JWKS_URL = os.getenv("GOOGLE_JWKS_URL", "https://www.googleapis.com/oauth2/v3/certs")
+GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+GOOGLE_JWKS_REFRESH_SECONDS = float(os.getenv("GOOGLE_JWKS_REFRESH_SECONDS", 3600))
 CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 REDIRECT_URI = "http://localhost:8000/auth/google/callback"
 
-async def handle_google_callback(db: Session, code: str):
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            GOOGLE_TOKEN_URL,
-            data={
-                "client_id": CLIENT_ID,
-                "client_secret": CLIENT_SECRET,
-                "code": code,
-                "grant_type": "authorization_code",
-                "redirect_uri": REDIRECT_URI,
-            },
+google_jwks = JWKSCache(GOOGLE_JWKS_URL, refresh_seconds=GOOGLE_JWKS_REFRESH_SECONDS)
+
+
+async def verify_google_id_token(id_token: str, access_token: str | None = None) -> dict:
+    """
+    Verify a Google id_token against the cached JWKS.
+
+    Checks the signature, audience (our client id), issuer and expiry.
+    A failed on-demand JWKS refresh is treated like a bad token.
+
+    Raises:
+        HTTPException: 401 if the token cannot be verified.
+    """
+    try:
+        kid = jwt.get_unverified_header(id_token).get("kid")
+        key = await google_jwks.get_key(kid) if kid else None
+        if key is None:
+            raise HTTPException(401, "Unknown Google signing key")
+        return jwt.decode(
+            id_token,
+            key,
+            algorithms=[key.get("alg", "RS256")],
+            audience=CLIENT_ID,
+            issuer=GOOGLE_ISSUERS,
+            access_token=access_token,
         )
+    except (JOSEError, httpx.HTTPError, ValueError):
+        raise HTTPException(401, "Invalid Google id_token")
+
+
+async def handle_google_callback(db: AsyncSession, code: str):
+    resp = await get_http_client().post(
+        GOOGLE_TOKEN_URL,
+        data={
+            "client_id": CLIENT_ID,
+            "client_secret": CLIENT_SECRET,
+            "code": code,
+            "grant_type": "authorization_code",
+            "redirect_uri": REDIRECT_URI,
+        },
+    )
 
     token_data = resp.json()
     id_token = token_data.get("id_token")
     if not id_token:
         raise HTTPException(400, "Invalid Google response")
 
-    payload = jwt.get_unverified_claims(id_token)
+    payload = await verify_google_id_token(id_token, token_data.get("access_token"))
 
     provider_user_id = payload["sub"]
     email = payload["email"]
 
-    provider = (
-        db.query(UserAuthProviders)
-        .filter_by(provider="google", provider_user_id=provider_user_id)
-        .first()
-    )
+    user = (
+        await db.scalars(
+            select(Users)
+            .join(UserAuthProviders, UserAuthProviders.user_id == Users.id)
+            .where(
+                UserAuthProviders.provider == "google",
+                UserAuthProviders.provider_user_id == provider_user_id,
+            )
+        )
+    ).first()
 
-    if provider:
-        user = provider.user
-    else:
-        user = db.query(Users).filter_by(email=email).first()
+    if not user:
+        user = (
+            await db.scalars(select(Users).where(Users.email == email))
+        ).first()
         if not user:
             user = Users(email=email, username=email.split("@")[0])
             db.add(user)
-            db.flush()
+            await db.flush()
 
         provider = UserAuthProviders(
             user_id=user.id,
@@ -57,7 +99,7 @@ async def handle_google_callback(db: Session, code: str):
         )
         db.add(provider)
 
-    db.commit()
+    await db.commit()
 
     return {
         "access_token": create_access_token({"user_id": user.id}),
@@ -0,0 +1,244 @@
+"""
+Incremental streak maintenance for goals.
+
+A goal day counts towards a streak once the summed weight of the sub-goals
+completed on that day reaches ``STREAK_DAY_THRESHOLD`` of the goal's total
+weight. Qualifying days are stored as runs of consecutive days
+(``GoalStreakRuns``), so recording a day - including a backdated one - only
+touches the runs directly adjacent to it instead of rescanning the whole
+completion history. `rebuild_goal_streaks` recomputes runs and counters
+from the `goal_daily_progress` rollup in bulk (e.g. after an import).
+"""
+
+import os
+from datetime import date, timedelta
+from typing import Iterable
+
+from sqlalchemy import Integer, case, cast, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import Goals, GoalDailyProgress, GoalStreakRuns, SubGoals
+from services.rollup_service import add_daily_progress
+
+STREAK_DAY_THRESHOLD = float(os.getenv("STREAK_DAY_THRESHOLD", 1.0))
+
+ONE_DAY = timedelta(days=1)
+
+# Tolerance for float weight sums (e.g. 0.1 + 0.2 vs 0.3).
+_EPSILON = 1e-9
+
+
+def day_qualifies(done_weight: float, total_weight: float) -> bool:
+    """Return True if `done_weight` satisfies the streak threshold for a day."""
+    if total_weight <= 0:
+        return False
+    return done_weight + _EPSILON >= total_weight * STREAK_DAY_THRESHOLD
+
+
+async def record_completion(
+    db: AsyncSession,
+    goal_id: int,
+    day: date,
+    added_weight: float,
+    added_count: int = 1,
+    today: date | None = None,
+    total_weight: float | None = None,
+) -> Goals:
+    """
+    Update a goal's daily rollup and streak counters after completions.
+
+    Must run in the same transaction as the insert of the completion rows
+    for `day` and before commit. The goal row is locked so concurrent
+    completions for the same goal are serialized.
+
+    Args:
+        db (AsyncSession): Active SQLAlchemy session.
+        goal_id (int): Goal the completed sub-goals belong to.
+        day (date): Day the sub-goals were completed on.
+        added_weight (float): Summed weight of the newly inserted completions.
+        added_count (int): Number of newly inserted completions.
+        today (date | None): The user's local day, for deciding whether the
+            latest run is still current. Defaults to the server's date.
+        total_weight (float | None): The goal's summed sub-goal weight, if
+            the caller already read it under the user's version lock.
+            Queried when omitted.
+
+    Returns:
+        Goals: The locked goal with updated streak counters.
+    """
+    goal = (
+        await db.execute(
+            select(Goals).where(Goals.id == goal_id).with_for_update()
+        )
+    ).scalar_one()
+
+    if total_weight is None:
+        total_weight = await db.scalar(
+            select(func.coalesce(func.sum(SubGoals.weight), 0.0))
+            .where(SubGoals.goal_id == goal_id)
+        )
+    done_weight = await add_daily_progress(db, goal_id, day, added_weight, added_count)
+
+    # Only the completion that pushes the day over the threshold extends
+    # the streak; later completions on an already qualifying day are no-ops.
+    if day_qualifies(done_weight - added_weight, total_weight):
+        return goal
+    if not day_qualifies(done_weight, total_weight):
+        return goal
+
+    await _add_qualifying_day(db, goal, day, today or date.today())
+    return goal
+
+
+async def _add_qualifying_day(db: AsyncSession, goal: Goals, day: date, today: date):
+    """Merge `day` into the goal's streak runs and refresh its counters."""
+    neighbours = (
+        await db.scalars(
+            select(GoalStreakRuns).where(
+                GoalStreakRuns.goal_id == goal.id,
+                GoalStreakRuns.start_day <= day + ONE_DAY,
+                GoalStreakRuns.end_day >= day - ONE_DAY,
+            )
+        )
+    ).all()
+    # The day qualified before (e.g. a sub-goal was added since, raising
+    # the threshold it now crosses again); its run is already recorded.
+    if any(r.start_day <= day <= r.end_day for r in neighbours):
+        return
+
+    before = next((r for r in neighbours if r.end_day == day - ONE_DAY), None)
+    after = next((r for r in neighbours if r.start_day == day + ONE_DAY), None)
+
+    if before and after:
+        end_day = after.end_day
+        await db.delete(after)
+        await db.flush()
+        before.end_day = end_day
+        run = before
+    elif before:
+        before.end_day = day
+        run = before
+    elif after:
+        after.start_day = day
+        run = after
+    else:
+        run = GoalStreakRuns(goal_id=goal.id, start_day=day, end_day=day)
+        db.add(run)
+
+    length = (run.end_day - run.start_day).days + 1
+    goal.longest_streak = max(goal.longest_streak or 0, length)
+
+    if goal.last_streak_day is None or run.end_day >= goal.last_streak_day:
+        goal.last_streak_day = run.end_day
+        goal.current_streak = length if run.end_day >= today - ONE_DAY else 0
+
+    # Later days recorded in the same transaction must see this run.
+    await db.flush()
+
+
+async def rebuild_goal_streaks(
+    db: AsyncSession,
+    goal_ids: Iterable[int],
+    today: date | None = None,
+) -> None:
+    """
+    Recompute streak runs and counters for `goal_ids` from the rollup.
+
+    Qualifying days are grouped into runs with the gaps-and-islands
+    technique (day minus its row number is constant within a run), all in
+    set-based SQL. The `goal_daily_progress` rollup must be up to date for
+    these goals. The caller commits.
+    """
+    goal_ids = list(goal_ids)
+    if not goal_ids:
+        return
+    today = today or date.today()
+
+    total_weight = (
+        select(
+            SubGoals.goal_id,
+            func.sum(SubGoals.weight).label("total_weight"),
+        )
+        .where(SubGoals.goal_id.in_(goal_ids))
+        .group_by(SubGoals.goal_id)
+        .subquery()
+    )
+    qualifying = (
+        select(
+            GoalDailyProgress.goal_id,
+            GoalDailyProgress.day,
+            # Postgres has date - integer but no date - bigint.
+            (
+                GoalDailyProgress.day
+                - cast(
+                    func.row_number().over(
+                        partition_by=GoalDailyProgress.goal_id,
+                        order_by=GoalDailyProgress.day,
+                    ),
+                    Integer,
+                )
+            ).label("island"),
+        )
+        .join(total_weight, total_weight.c.goal_id == GoalDailyProgress.goal_id)
+        .where(
+            GoalDailyProgress.goal_id.in_(goal_ids),
+            GoalDailyProgress.done_weight + _EPSILON
+            >= total_weight.c.total_weight * STREAK_DAY_THRESHOLD,
+        )
+        .subquery()
+    )
+    islands = select(
+        qualifying.c.goal_id,
+        func.min(qualifying.c.day),
+        func.max(qualifying.c.day),
+    ).group_by(qualifying.c.goal_id, qualifying.c.island)
+
+    await db.execute(delete(GoalStreakRuns).where(GoalStreakRuns.goal_id.in_(goal_ids)))
+    await db.execute(
+        insert(GoalStreakRuns).from_select(["goal_id", "start_day", "end_day"], islands)
+    )
+
+    length = GoalStreakRuns.end_day - GoalStreakRuns.start_day + 1
+    runs = (
+        select(
+            GoalStreakRuns.goal_id,
+            GoalStreakRuns.end_day,
+            length.label("length"),
+            func.row_number()
+            .over(
+                partition_by=GoalStreakRuns.goal_id,
+                order_by=GoalStreakRuns.end_day.desc(),
+            )
+            .label("recency"),
+        )
+        .where(GoalStreakRuns.goal_id.in_(goal_ids))
+        .subquery()
+    )
+    summary = (
+        select(
+            runs.c.goal_id,
+            func.max(runs.c.length).label("longest"),
+            func.max(runs.c.end_day).label("last_day"),
+            func.max(runs.c.length).filter(runs.c.recency == 1).label("last_length"),
+        )
+        .group_by(runs.c.goal_id)
+        .subquery()
+    )
+
+    await db.execute(
+        update(Goals)
+        .where(Goals.id.in_(goal_ids))
+        .values(current_streak=0, longest_streak=0, last_streak_day=None)
+    )
+    await db.execute(
+        update(Goals)
+        .where(Goals.id == summary.c.goal_id)
+        .values(
+            longest_streak=summary.c.longest,
+            last_streak_day=summary.c.last_day,
+            current_streak=case(
+                (summary.c.last_day >= today - ONE_DAY, summary.c.last_length),
+                else_=0,
+            ),
+        )
+    )
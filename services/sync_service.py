@@ -0,0 +1,181 @@
+"""
+Delta sync for offline-first clients.
+
+Goals, sub-goals and completions carry a `change_seq` from one global
+sequence. It is assigned on insert and bumped by triggers on every update.
+Deletes leave a row in `sync_tombstones`. Any change to a sub-goal or completion also bumps
+its goal, so only goals changed since the cursor need to be searched for
+changed children. Every query is an index range scan on
+(owner, change_seq), which keeps a sync proportional to what changed.
+
+The cursor is the highest `change_seq` returned. Writers bump the user's
+goals version before writing (see `version_service`). That row lock
+serializes a user's transactions, so a change committed after a sync
+always carries a higher sequence than that sync's cursor.
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Date,
+    Float,
+    Integer,
+    String,
+    cast,
+    literal,
+    null,
+    select,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+from models.models import Goals, SubGoals, SubGoalDailyCompletion, SyncTombstones
+from utils.cursor import decode_cursor, encode_cursor
+from utils.user_cache import Principal
+
+DEFAULT_SYNC_LIMIT = 500
+MAX_SYNC_LIMIT = 2000
+
+# Columns of the combined change stream; each kind fills its own subset.
+_COLUMNS = {
+    "id": Integer,
+    "goal_id": Integer,
+    "subgoal_id": Integer,
+    "title": String,
+    "total_days": Integer,
+    "start_date": Date,
+    "current_streak": Integer,
+    "longest_streak": Integer,
+    "name": String,
+    "weight": Float,
+    "completed_on": Date,
+    "completed": Boolean,
+    "entity": String,
+}
+
+_FIELDS = {
+    "goals": ("id", "title", "total_days", "start_date", "current_streak", "longest_streak"),
+    "subgoals": ("id", "goal_id", "name", "weight"),
+    "completions": ("id", "subgoal_id", "completed_on", "completed"),
+    "deleted": ("entity", "id"),
+}
+
+
+def _decode_sync_cursor(cursor: str) -> int:
+    payload = decode_cursor(cursor)
+    try:
+        return int(payload["s"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _branch(kind: str, change_seq, where, limit: int, **columns):
+    """One kind's changes, padded to the combined column set."""
+    query = select(
+        change_seq.label("change_seq"),
+        literal(kind).label("kind"),
+        *(
+            (columns[name] if name in columns else cast(null(), type_)).label(name)
+            for name, type_ in _COLUMNS.items()
+        ),
+    ).where(*where)
+    return query.order_by(change_seq).limit(limit).subquery(kind).select()
+
+
+async def get_changes(
+    db: AsyncSession,
+    user: Principal,
+    cursor: str | None = None,
+    limit: int = DEFAULT_SYNC_LIMIT,
+) -> dict:
+    """
+    Return the user's changes after `cursor`, oldest first.
+
+    Without a cursor the whole account is returned, page by page. All four
+    kinds are read with one UNION ALL statement, so they share a single
+    snapshot. Each kind contributes at most `limit` + 1 rows in
+    `change_seq` order, and the merged stream is cut after the `limit`
+    lowest sequences, so pages never skip a change.
+
+    Args:
+        cursor (str | None): `cursor` from the previous response.
+        limit (int): Maximum number of changes, clamped to MAX_SYNC_LIMIT.
+
+    Returns:
+        dict: {"goals", "subgoals", "completions", "deleted": [...],
+        "cursor": str, "has_more": bool}
+    """
+    limit = max(1, min(limit, MAX_SYNC_LIMIT))
+    since = _decode_sync_cursor(cursor) if cursor else 0
+
+    changed_goals = select(Goals.id).where(
+        Goals.user_id == user.id,
+        Goals.change_seq > since,
+    )
+    changed_subgoals = select(SubGoals.id).where(SubGoals.goal_id.in_(changed_goals))
+
+    stream = union_all(
+        _branch(
+            "goals",
+            Goals.change_seq,
+            (Goals.user_id == user.id, Goals.change_seq > since),
+            limit + 1,
+            id=Goals.id,
+            title=Goals.title,
+            total_days=Goals.total_days,
+            start_date=Goals.start_date,
+            current_streak=Goals.current_streak,
+            longest_streak=Goals.longest_streak,
+        ),
+        _branch(
+            "subgoals",
+            SubGoals.change_seq,
+            (SubGoals.goal_id.in_(changed_goals), SubGoals.change_seq > since),
+            limit + 1,
+            id=SubGoals.id,
+            goal_id=SubGoals.goal_id,
+            name=SubGoals.name,
+            weight=SubGoals.weight,
+        ),
+        _branch(
+            "completions",
+            SubGoalDailyCompletion.change_seq,
+            (
+                SubGoalDailyCompletion.subgoal_id.in_(changed_subgoals),
+                SubGoalDailyCompletion.change_seq > since,
+            ),
+            limit + 1,
+            id=SubGoalDailyCompletion.id,
+            subgoal_id=SubGoalDailyCompletion.subgoal_id,
+            completed_on=SubGoalDailyCompletion.completed_on,
+            completed=SubGoalDailyCompletion.completed,
+        ),
+        _branch(
+            "deleted",
+            SyncTombstones.change_seq,
+            (SyncTombstones.user_id == user.id, SyncTombstones.change_seq > since),
+            limit + 1,
+            id=SyncTombstones.entity_id,
+            entity=SyncTombstones.entity,
+        ),
+    ).subquery("changes")
+
+    rows = (
+        await db.execute(
+            select(stream).order_by(stream.c.change_seq).limit(limit + 1)
+        )
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    result = {kind: [] for kind in _FIELDS}
+    for row in rows:
+        result[row.kind].append({field: getattr(row, field) for field in _FIELDS[row.kind]})
+
+    last_seq = rows[-1].change_seq if rows else since
+    result["cursor"] = encode_cursor({"s": last_seq})
+    result["has_more"] = has_more
+    return result
@@ -0,0 +1,29 @@
+"""User profile services."""
+
+from fastapi import HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import Users
+from utils.user_cache import Principal, invalidate_user, load_principal
+
+
+async def set_timezone(db: AsyncSession, user: Principal, tz_name: str) -> Principal:
+    """
+    Change the user's timezone and return the refreshed principal.
+
+    The cached principal is invalidated so the new day boundary applies to
+    the user's next request on every worker sharing the cache backend.
+    """
+    result = await db.execute(
+        update(Users).where(Users.id == user.id).values(timezone=tz_name)
+    )
+    if result.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    await db.commit()
+    invalidate_user(user.id)
+    return await load_principal(db, user.id)
@@ -0,0 +1,63 @@
+"""
+Per-user goals version.
+
+Every write to a user's goals, sub-goals or completions bumps
+`Users.goals_version` in the same transaction. Readers compare versions
+(e.g. through ETags) to detect changes without loading any goals.
+
+Writers bump the version before their other writes. The row lock it
+takes therefore comes before any goal row lock (such as
+`record_completion`'s ``FOR UPDATE`` or the ``KEY SHARE`` lock a
+sub-goal insert takes on its goal). All writers lock the user row first
+and then goal rows, so they cannot deadlock each other. The lock also
+serializes a user's write transactions.
+As a result, the `change_seq` values they draw commit in increasing
+order, which delta sync relies on (see `sync_service`).
+"""
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import Users
+
+
+async def bump_goals_version(db: AsyncSession, user_id: int) -> None:
+    """
+    Increment the user's goals version; the caller commits.
+
+    Call it before the transaction writes any goal, sub-goal or completion.
+    """
+    await db.execute(
+        update(Users)
+        .where(Users.id == user_id)
+        # Keep updated_at for profile changes, not goal activity.
+        .values(goals_version=Users.goals_version + 1, updated_at=Users.updated_at)
+    )
+
+
+async def get_goals_version(db: AsyncSession, user_id: int) -> int:
+    """Return the user's current goals version."""
+    return await db.scalar(select(Users.goals_version).where(Users.id == user_id)) or 0
+
+
+async def bump_goals_versions(db: AsyncSession, user_ids) -> None:
+    """
+    Increment the goals version of many users at once; the caller commits.
+
+    Rows are locked in id order first, so concurrent batch jobs touching
+    overlapping users cannot deadlock.
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+    await db.execute(
+        select(Users.id)
+        .where(Users.id.in_(user_ids))
+        .order_by(Users.id)
+        .with_for_update()
+    )
+    await db.execute(
+        update(Users)
+        .where(Users.id.in_(user_ids))
+        .values(goals_version=Users.goals_version + 1, updated_at=Users.updated_at)
+    )
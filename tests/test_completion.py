@@ -0,0 +1,131 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from conftest import run_async
+from db import open_async_session
+from models.models import GoalStreakRuns
+from schemas.completionschema import SubGoalCompletionItem
+from schemas.goalschema import GoalCreate, SubGoalCreate
+from services.completion_service import complete_subgoal, complete_subgoals_batch
+from services.goal_service import create_goal, create_subgoal
+from test_goals_query_count import _count_statements
+from utils.timeutil import local_today
+
+# Version bump, ownership-checked insert (with the goal's total weight),
+# goal lock and rollup upsert; a qualifying day adds the neighbouring-run
+# lookup, the counter update and the new run.
+MAX_STATEMENTS = 7
+
+
+def test_complete_subgoal_extends_the_streak_in_few_statements(test_user):
+    day = date(2026, 3, 2)
+
+    async def scenario():
+        async with open_async_session() as db:
+            goal = await create_goal(
+                db,
+                test_user,
+                GoalCreate(title="weights", total_days=30, start_date=date(2026, 3, 1)),
+            )
+            light = await create_subgoal(
+                db, test_user, goal.id, SubGoalCreate(name="light", weight=1.0)
+            )
+            heavy = await create_subgoal(
+                db, test_user, goal.id, SubGoalCreate(name="heavy", weight=3.0)
+            )
+
+        async with open_async_session() as db:
+            partial = await complete_subgoal(db, test_user, heavy.id, day)
+            with _count_statements() as statements:
+                full = await complete_subgoal(db, test_user, light.id, day)
+            again = await complete_subgoal(db, test_user, light.id, day)
+        return partial, full, again, statements
+
+    partial, full, again, statements = run_async(scenario)
+
+    assert partial["longest_streak"] == 0
+    assert full["longest_streak"] == 1
+    assert again == {"message": "Already completed for this day"}
+    assert len(statements) <= MAX_STATEMENTS, statements
+
+
+def test_completing_a_day_that_already_qualified_keeps_its_run(test_user):
+    days = [date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 3)]
+
+    async def scenario():
+        async with open_async_session() as db:
+            goal = await create_goal(
+                db,
+                test_user,
+                GoalCreate(title="grow", total_days=30, start_date=date(2026, 3, 1)),
+            )
+            first = await create_subgoal(
+                db, test_user, goal.id, SubGoalCreate(name="first", weight=1.0)
+            )
+            for day in days:
+                await complete_subgoal(db, test_user, first.id, day)
+
+            # A new sub-goal raises the threshold; completing it re-crosses
+            # it on days that are already inside the run.
+            second = await create_subgoal(
+                db, test_user, goal.id, SubGoalCreate(name="second", weight=1.0)
+            )
+            results = [
+                await complete_subgoal(db, test_user, second.id, day)
+                for day in (days[2], days[0], days[1])
+            ]
+
+            runs = (
+                await db.execute(
+                    select(GoalStreakRuns.start_day, GoalStreakRuns.end_day)
+                    .where(GoalStreakRuns.goal_id == goal.id)
+                )
+            ).all()
+        return results, runs
+
+    results, runs = run_async(scenario)
+
+    assert [r["longest_streak"] for r in results] == [3, 3, 3]
+    assert runs == [(days[0], days[2])]
+
+
+def test_completions_after_the_local_today_are_rejected(test_user):
+    today = local_today(test_user.timezone)
+    tomorrow = today + timedelta(days=1)
+
+    async def scenario():
+        async with open_async_session() as db:
+            goal = await create_goal(
+                db,
+                test_user,
+                GoalCreate(title="ahead", total_days=30, start_date=today),
+            )
+            sub = await create_subgoal(
+                db, test_user, goal.id, SubGoalCreate(name="only", weight=1.0)
+            )
+            with pytest.raises(HTTPException) as single:
+                await complete_subgoal(db, test_user, sub.id, tomorrow)
+            results = await complete_subgoals_batch(
+                db,
+                test_user,
+                [
+                    SubGoalCompletionItem(subgoal_id=sub.id, completed_on=tomorrow),
+                    SubGoalCompletionItem(subgoal_id=sub.id, completed_on=today),
+                ],
+            )
+            runs = (
+                await db.execute(
+                    select(GoalStreakRuns.start_day, GoalStreakRuns.end_day)
+                    .where(GoalStreakRuns.goal_id == goal.id)
+                )
+            ).all()
+        return single.value, results, runs
+
+    single, results, runs = run_async(scenario)
+
+    assert single.status_code == 422
+    assert [r["status"] for r in results] == ["future_day", "completed"]
+    assert runs == [(today, today)]
@@ -0,0 +1,83 @@
+import asyncio
+
+import asyncpg
+import orjson
+
+from conftest import run_async
+from utils.events import (
+    RESYNC_EVENT,
+    EventBroker,
+    LocalEventBackend,
+    PostgresNotifyBackend,
+)
+
+
+def test_local_broker_delivers_to_the_users_subscribers_only():
+    async def scenario():
+        broker = EventBroker(LocalEventBackend(), queue_size=2)
+        await broker.start()
+        mine, other = broker.subscribe(1), broker.subscribe(2)
+
+        await broker.publish(1, "goal.created", {"goal": {"id": 7}})
+        first = orjson.loads(mine.get_nowait())
+
+        for i in range(3):
+            await broker.publish(1, "goal.created", {"goal": {"id": i}})
+        overflow = [mine.get_nowait() for _ in range(mine.qsize())]
+
+        broker.unsubscribe(1, mine)
+        broker.unsubscribe(2, other)
+        await broker.stop()
+        return first, other.empty(), overflow, broker.subscriber_count()
+
+    first, other_empty, overflow, subscribers = run_async(scenario)
+
+    assert first == {"type": "goal.created", "goal": {"id": 7}}
+    assert other_empty
+    # A subscriber that falls behind gets one resync instead of a backlog.
+    assert overflow == [RESYNC_EVENT]
+    assert subscribers == 0
+
+
+def test_postgres_listener_reconnects_after_an_interface_error(monkeypatch):
+    attempts = []
+
+    async def connect(_dsn):
+        attempts.append(_dsn)
+        raise asyncpg.InterfaceError("connection is closed")
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+
+    async def scenario():
+        backend = PostgresNotifyBackend(dsn="postgresql://unused", reconnect_seconds=0.01)
+        await backend.start(lambda _user_id, _event: None)
+        try:
+            for _ in range(100):
+                if len(attempts) >= 3:
+                    break
+                await asyncio.sleep(0.01)
+            return not backend._task.done()  # pylint: disable=protected-access
+        finally:
+            await backend.stop()
+
+    assert run_async(scenario)
+    assert len(attempts) >= 3
+
+
+def test_postgres_backend_fans_out_with_only_db_url(migrated_db):
+    async def scenario():
+        # No DSN given: resolved from DB_URL when the broker starts.
+        broker = EventBroker(PostgresNotifyBackend(reconnect_seconds=0.1))
+        queue = broker.subscribe(42)
+        await broker.start()
+        try:
+            for _ in range(50):
+                if broker.backend._conn is not None:  # pylint: disable=protected-access
+                    break
+                await asyncio.sleep(0.1)
+            await broker.publish(42, "subgoal.created", {"goal_id": 1})
+            return orjson.loads(await asyncio.wait_for(queue.get(), 5))
+        finally:
+            await broker.stop()
+
+    assert run_async(scenario) == {"type": "subgoal.created", "goal_id": 1}
@@ -0,0 +1,17 @@
+from services.goal_cache import (
+    get_goal_tree_view,
+    invalidate_goal_tree,
+    store_goal_tree_view,
+)
+
+
+def test_view_is_served_only_for_the_version_it_was_built_from():
+    store_goal_tree_view(1, "view", 3, b"body-v3")
+
+    assert get_goal_tree_view(1, "view", 3) == b"body-v3"
+    # Another worker committed a write: the DB version moved on.
+    assert get_goal_tree_view(1, "view", 4) is None
+    assert get_goal_tree_view(1, "other-view", 3) is None
+
+    invalidate_goal_tree(1)
+    assert get_goal_tree_view(1, "view", 3) is None
@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+from datetime import date
+
+from sqlalchemy import event, insert
+
+from conftest import run_async
+from db import get_async_engine, open_async_session
+from models.models import Goals, SubGoals
+from services.goal_service import get_user_goals
+
+GOALS = 120
+SUBGOALS_PER_GOAL = 5
+PAGE_SIZE = 50
+# One query per page: 120 goals in pages of 50.
+MAX_STATEMENTS = 3
+
+
+@contextmanager
+def _count_statements():
+    statements = []
+
+    def before_cursor_execute(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    engine = get_async_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_listing_goals_is_one_statement_per_page(test_user):
+    async def scenario():
+        async with open_async_session() as db:
+            goal_ids = (
+                await db.scalars(
+                    insert(Goals).returning(Goals.id),
+                    [
+                        {
+                            "user_id": test_user.id,
+                            "title": f"goal {i}",
+                            "total_days": 30,
+                            "start_date": date(2026, 1, 1),
+                        }
+                        for i in range(GOALS)
+                    ],
+                )
+            ).all()
+            await db.execute(
+                insert(SubGoals),
+                [
+                    {"goal_id": goal_id, "name": f"step {i}", "weight": 1.0}
+                    for goal_id in goal_ids
+                    for i in range(SUBGOALS_PER_GOAL)
+                ],
+            )
+            await db.commit()
+
+        pages = []
+        with _count_statements() as statements:
+            async with open_async_session() as db:
+                cursor = None
+                while True:
+                    page = await get_user_goals(db, test_user, cursor=cursor, limit=PAGE_SIZE)
+                    pages.append(page["items"])
+                    cursor = page["next_cursor"]
+                    if cursor is None:
+                        break
+        return pages, statements
+
+    pages, statements = run_async(scenario)
+
+    assert [len(items) for items in pages] == [50, 50, 20]
+    assert all(len(goal["subgoals"]) == SUBGOALS_PER_GOAL for items in pages for goal in items)
+    # No lazy loads or per-goal queries, however many sub-goals there are.
+    assert len(statements) <= MAX_STATEMENTS, statements
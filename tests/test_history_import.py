@@ -0,0 +1,74 @@
+from datetime import date
+
+from sqlalchemy import select
+
+from conftest import run_async
+from db import open_async_session
+from models.models import Goals, SubGoals
+from schemas.goalschema import GoalCreate, SubGoalCreate
+from services.completion_service import complete_subgoal
+from services.export_service import export_user_history
+from services.goal_service import create_goal, create_subgoal
+from services.import_service import _csv_records, import_user_history
+
+TRICKY_TITLE = 'Read "War and Peace",\ntwice'
+
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(records):
+    return [record async for record in records]
+
+
+def test_csv_records_keep_quoted_newlines_together():
+    stream = _chunks(b'a,b\r\n1,"x\r\ny ""q""', b'"\r\n2,z\r\n')
+
+    records = run_async(_collect, _csv_records(stream))
+
+    assert records == [
+        (1, b"a,b"),
+        (2, b'1,"x\ny ""q"""'),
+        (4, b"2,z"),
+    ]
+
+
+def test_csv_export_round_trips_through_import(test_user):
+    async def scenario():
+        async with open_async_session() as db:
+            goal = await create_goal(
+                db,
+                test_user,
+                GoalCreate(title=TRICKY_TITLE, total_days=30, start_date=date(2026, 1, 1)),
+            )
+            subgoal = await create_subgoal(
+                db, test_user, goal.id, SubGoalCreate(name="chapter,\none", weight=2.0)
+            )
+            await complete_subgoal(db, test_user, subgoal.id, date(2026, 1, 2))
+
+        exported = b"".join([chunk async for chunk in export_user_history(test_user.id, "csv")])
+
+        async with open_async_session() as db:
+            summary = await import_user_history(db, test_user, _chunks(exported), "csv")
+
+        async with open_async_session() as db:
+            titles = (
+                await db.scalars(select(Goals.title).where(Goals.user_id == test_user.id))
+            ).all()
+            names = (
+                await db.scalars(
+                    select(SubGoals.name)
+                    .join(Goals, Goals.id == SubGoals.goal_id)
+                    .where(Goals.user_id == test_user.id)
+                )
+            ).all()
+        return summary, titles, names
+
+    summary, titles, names = run_async(scenario)
+
+    assert summary["error_count"] == 0, summary["errors"]
+    assert summary["imported"] == {"goals": 1, "subgoals": 1, "completions": 1}
+    assert titles == [TRICKY_TITLE, TRICKY_TITLE]
+    assert names == ["chapter,\none", "chapter,\none"]
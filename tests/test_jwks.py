@@ -0,0 +1,143 @@
+import time
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+from conftest import run_async
+from services import sso_service
+from utils import http_client
+from utils.jwks import JWKSCache
+
+JWKS_URL = "https://jwks.test/certs"
+CLIENT_ID = "client-id"
+
+
+def _signing_key(kid):
+    pem = rsa.generate_private_key(public_exponent=65537, key_size=2048).private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public = jwk.construct(pem, "RS256").public_key().to_dict()
+    return pem, {**public, "kid": kid, "alg": "RS256", "use": "sig"}
+
+
+OLD_PEM, OLD_JWK = _signing_key("old")
+NEW_PEM, NEW_JWK = _signing_key("new")
+
+
+def _id_token(pem, kid):
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": "42",
+        "email": "user@example.invalid",
+        "exp": int(time.time()) + 300,
+    }
+    return jwt.encode(claims, pem, algorithm="RS256", headers={"kid": kid})
+
+
+class FakeJWKSEndpoint:
+    """Serves `published` keys and records every request."""
+
+    def __init__(self, *keys):
+        self.published = list(keys)
+        self.requests = 0
+        self.body = None
+
+    def __call__(self, request):
+        assert str(request.url) == JWKS_URL
+        self.requests += 1
+        if self.body is not None:
+            return httpx.Response(200, content=self.body)
+        return httpx.Response(
+            200,
+            json={"keys": self.published},
+            headers={"Cache-Control": "public, max-age=600"},
+        )
+
+
+@pytest.fixture
+def endpoint(monkeypatch):
+    endpoint = FakeJWKSEndpoint(OLD_JWK)
+    monkeypatch.setattr(
+        http_client, "_client", httpx.AsyncClient(transport=httpx.MockTransport(endpoint))
+    )
+    monkeypatch.setattr(sso_service, "google_jwks", JWKSCache(JWKS_URL, min_refresh_interval=30))
+    monkeypatch.setattr(sso_service, "CLIENT_ID", CLIENT_ID)
+    return endpoint
+
+
+def _verify(token):
+    return run_async(sso_service.verify_google_id_token, token)
+
+
+def _status(token):
+    with pytest.raises(HTTPException) as excinfo:
+        _verify(token)
+    return excinfo.value.status_code
+
+
+def test_verifies_tokens_from_the_cached_key_set(endpoint):
+    assert _verify(_id_token(OLD_PEM, "old"))["sub"] == "42"
+    assert _verify(_id_token(OLD_PEM, "old"))["sub"] == "42"
+
+    assert endpoint.requests == 1
+    assert sso_service.google_jwks._max_age == 600  # pylint: disable=protected-access
+
+
+def test_unknown_kid_refreshes_to_pick_up_rotated_keys(endpoint):
+    _verify(_id_token(OLD_PEM, "old"))
+    endpoint.published = [NEW_JWK]
+    # Move past the refresh throttle.
+    sso_service.google_jwks._fetched_at -= 60  # pylint: disable=protected-access
+
+    assert _verify(_id_token(NEW_PEM, "new"))["sub"] == "42"
+    assert endpoint.requests == 2
+
+
+def test_unknown_kid_refreshes_are_throttled(endpoint):
+    _verify(_id_token(OLD_PEM, "old"))
+
+    for _ in range(5):
+        assert _status(_id_token(NEW_PEM, "new")) == 401
+
+    assert endpoint.requests == 1
+
+
+def test_bad_signature_is_rejected(endpoint):
+    # Signed with the new key but claims the old key id.
+    assert _status(_id_token(NEW_PEM, "old")) == 401
+
+
+@pytest.mark.parametrize(
+    "body",
+    [b"not json", b"[1, 2]", b'{"keys": ["kid"]}'],
+)
+def test_malformed_key_set_on_refresh_is_an_invalid_token(endpoint, body):
+    endpoint.body = body
+
+    assert _status(_id_token(OLD_PEM, "old")) == 401
+
+
+def test_failed_refresh_is_an_invalid_token(endpoint, monkeypatch):
+    def unreachable(_request):
+        raise httpx.ConnectError("unreachable")
+
+    monkeypatch.setattr(
+        http_client, "_client", httpx.AsyncClient(transport=httpx.MockTransport(unreachable))
+    )
+
+    assert _status(_id_token(OLD_PEM, "old")) == 401
+
+
+def test_refresh_rejects_a_non_jwks_document(endpoint):
+    endpoint.body = b'{"keys": [1]}'
+    cache = JWKSCache(JWKS_URL)
+
+    with pytest.raises(ValueError):
+        run_async(cache.refresh)
@@ -0,0 +1,31 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import metrics
+from utils import dependencies
+
+TOKEN = "metrics-secret"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(dependencies, "METRICS_TOKEN", TOKEN)
+    app = FastAPI()
+    app.include_router(metrics.router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/metrics/db-pool", "/metrics/token-cache", "/metrics/events"])
+def test_metrics_require_the_metrics_token(client, path):
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get(path, headers={"Authorization": f"Bearer {TOKEN}"}).status_code == 200
+
+
+def test_metrics_are_disabled_without_a_configured_token(client, monkeypatch):
+    monkeypatch.setattr(dependencies, "METRICS_TOKEN", None)
+
+    response = client.get("/metrics/events", headers={"Authorization": f"Bearer {TOKEN}"})
+
+    assert response.status_code == 404
@@ -0,0 +1,103 @@
+import os
+from datetime import date, datetime, timedelta, timezone
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, select, text, update
+
+from conftest import ROOT, run_async
+from db import get_engine, open_async_session
+from models.models import Goals, GoalStreakRuns, SubGoalDailyCompletion, SubGoals, Users
+from services.rollup_service import rebuild_daily_progress
+from test_streak_rebuild import _days, _seed_goal
+
+
+def test_0007_backfills_streak_runs_and_counters(test_user):
+    # The migration uses the owner's local day; test users are on UTC.
+    today = datetime.now(timezone.utc).date()
+
+    async def seed():
+        async with open_async_session() as db:
+            current_id = await _seed_goal(
+                db, test_user.id, _days(today - timedelta(days=3), 3)
+            )
+            old_id = await _seed_goal(
+                db, test_user.id, _days(date(2025, 1, 1), 6) + [date(2025, 2, 1)]
+            )
+            await rebuild_daily_progress(db, [current_id, old_id])
+            await db.commit()
+        return current_id, old_id
+
+    current_id, old_id = run_async(seed)
+    # Counters as a pre-0002 database left them: never maintained.
+    with get_engine().begin() as conn:
+        conn.execute(
+            update(Goals)
+            .where(Goals.user_id == test_user.id)
+            .values(current_streak=0, longest_streak=0, last_streak_day=None)
+        )
+        version = conn.scalar(select(Users.goals_version).where(Users.id == test_user.id))
+
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    command.downgrade(config, "0006")
+    command.upgrade(config, "head")
+
+    with get_engine().connect() as conn:
+        runs = conn.execute(
+            select(GoalStreakRuns.goal_id, GoalStreakRuns.start_day, GoalStreakRuns.end_day)
+            .where(GoalStreakRuns.goal_id.in_([current_id, old_id]))
+            .order_by(GoalStreakRuns.goal_id, GoalStreakRuns.start_day)
+        ).all()
+        goals = {
+            row.id: row
+            for row in conn.execute(
+                select(Goals).where(Goals.id.in_([current_id, old_id]))
+            )
+        }
+        new_version = conn.scalar(
+            select(Users.goals_version).where(Users.id == test_user.id)
+        )
+
+    assert runs == [
+        (current_id, today - timedelta(days=3), today - timedelta(days=1)),
+        (old_id, date(2025, 1, 1), date(2025, 1, 6)),
+        (old_id, date(2025, 2, 1), date(2025, 2, 1)),
+    ]
+    assert (goals[current_id].current_streak, goals[current_id].longest_streak) == (3, 3)
+    assert goals[current_id].last_streak_day == today - timedelta(days=1)
+    assert (goals[old_id].current_streak, goals[old_id].longest_streak) == (0, 6)
+    assert goals[old_id].last_streak_day == date(2025, 2, 1)
+    assert new_version == version + 1
+
+
+def test_0006_backfills_change_seq_in_batches(test_user, monkeypatch):
+    async def seed():
+        async with open_async_session() as db:
+            goal_ids = [
+                await _seed_goal(db, test_user.id, _days(date(2026, 1, 1), 3))
+                for _ in range(2)
+            ]
+            await db.commit()
+        return goal_ids
+
+    goal_ids = run_async(seed)
+
+    monkeypatch.setenv("SYNC_BACKFILL_BATCH", "1")
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    command.downgrade(config, "0005")
+    command.upgrade(config, "head")
+
+    with get_engine().connect() as conn:
+        for model in (Goals, SubGoals, SubGoalDailyCompletion):
+            table = model.__tablename__
+            assert conn.scalar(
+                text(f"SELECT count(*) FROM {table} WHERE change_seq IS NULL")
+            ) == 0
+            columns = {c["name"]: c for c in inspect(conn).get_columns(table)}
+            assert columns["change_seq"]["nullable"] is False
+            checks = {c["name"] for c in inspect(conn).get_check_constraints(table)}
+            assert f"{table}_change_seq_not_null" not in checks
+        seqs = conn.scalars(
+            select(Goals.change_seq).where(Goals.id.in_(goal_ids))
+        ).all()
+    assert len(set(seqs)) == len(goal_ids)
@@ -0,0 +1,182 @@
+"""
+Query-plan regression test for the hot service queries.
+
+Seeds a small dataset inside a transaction, runs the goal, completion and
+progress services against it while capturing every SQL statement they
+issue, then runs ``EXPLAIN`` on each statement with sequential scans
+disabled. Postgres still picks a sequential scan when no index can serve
+a predicate, so any remaining ``Seq Scan`` on an application table means
+a missing index. Everything is rolled back afterwards.
+
+Needs TEST_DATABASE_URL, like the other database tests.
+"""
+
+import json
+from datetime import date, timedelta
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from conftest import run_async
+from db import get_async_engine
+from models.models import Goals, SubGoals, SubGoalDailyCompletion, Users
+from schemas.completionschema import SubGoalCompletionItem
+from schemas.goalschema import GoalCreate, SubGoalCreate
+from services.completion_service import complete_subgoal, complete_subgoals_batch
+from services.goal_service import create_goal, create_subgoal, get_user_goals
+from services.progress_service import get_goal_heatmap, get_goals_progress
+from services.sync_service import get_changes
+from utils.user_cache import Principal
+
+CHECKED_TABLES = {
+    "users",
+    "goals",
+    "subgoals",
+    "subgoal_daily_completion",
+    "goal_streak_runs",
+    "goal_daily_progress",
+    "sync_tombstones",
+}
+
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+async def _seed(conn, goals=20, subgoals=5, days=30):
+    start = date.today() - timedelta(days=days)
+    user_id = (
+        await conn.execute(
+            insert(Users)
+            .values(username="plan-check", email="plan-check@example.invalid")
+            .returning(Users.id)
+        )
+    ).scalar_one()
+    goal_ids = (
+        await conn.execute(
+            insert(Goals).returning(Goals.id),
+            [
+                {
+                    "user_id": user_id,
+                    "title": f"goal {i}",
+                    "total_days": days * 2,
+                    "start_date": start,
+                    "current_streak": 0,
+                    "longest_streak": 0,
+                }
+                for i in range(goals)
+            ],
+        )
+    ).scalars().all()
+    subgoal_ids = (
+        await conn.execute(
+            insert(SubGoals).returning(SubGoals.id),
+            [
+                {"goal_id": goal_id, "name": f"sub {i}", "weight": 1.0}
+                for goal_id in goal_ids
+                for i in range(subgoals)
+            ],
+        )
+    ).scalars().all()
+    await conn.execute(
+        insert(SubGoalDailyCompletion),
+        [
+            {
+                "subgoal_id": subgoal_id,
+                "completed_on": start + timedelta(days=d),
+                "completed": True,
+            }
+            for subgoal_id in subgoal_ids
+            for d in range(0, days, 2)
+        ],
+    )
+    return user_id, goal_ids, subgoal_ids
+
+
+async def _exercise_services(db, principal, goal_ids, subgoal_ids):
+    page = await get_user_goals(db, principal, limit=5)
+    await get_user_goals(db, principal, cursor=page["next_cursor"], limit=5)
+    await get_user_goals(db, principal, goal_status="active")
+    goal = await create_goal(
+        db,
+        principal,
+        GoalCreate(title="plan check", total_days=10, start_date=date.today()),
+    )
+    await create_subgoal(db, principal, goal.id, SubGoalCreate(name="plan check"))
+    await complete_subgoal(db, principal, subgoal_ids[0], None)
+    await complete_subgoals_batch(
+        db,
+        principal,
+        [SubGoalCompletionItem(subgoal_id=sid) for sid in subgoal_ids[:10]],
+    )
+    await get_goals_progress(db, principal)
+    await get_goals_progress(db, principal, goal_id=goal_ids[0])
+    await get_goal_heatmap(db, principal, goal_ids[0], intensity=True)
+    changes = await get_changes(db, principal, limit=50)
+    await get_changes(db, principal, cursor=changes["cursor"])
+
+
+def _seq_scans(node):
+    if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in CHECKED_TABLES:
+        yield node["Relation Name"]
+    for child in node.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+async def check_query_plans():
+    """
+    Run the plan check.
+
+    Returns:
+        list[tuple[str, str]]: (table, statement) for every sequential scan
+        found; empty when all hot queries are index-backed.
+    """
+    problems = []
+    async with get_async_engine().connect() as conn:
+        trans = await conn.begin()
+        try:
+            user_id, goal_ids, subgoal_ids = await _seed(conn)
+            await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+            captured = []
+
+            def capture(_conn, _cursor, statement, parameters, _context, executemany):
+                if not executemany and statement.lstrip().upper().startswith(_EXPLAINABLE):
+                    captured.append((statement, parameters))
+
+            sync_conn = conn.sync_connection
+            event.listen(sync_conn, "before_cursor_execute", capture)
+            try:
+                db = AsyncSession(
+                    bind=conn,
+                    join_transaction_mode="create_savepoint",
+                    expire_on_commit=False,
+                )
+                principal = Principal(
+                    id=user_id,
+                    username="plan-check",
+                    email="plan-check@example.invalid",
+                    has_password=False,
+                )
+                await _exercise_services(db, principal, goal_ids, subgoal_ids)
+            finally:
+                event.remove(sync_conn, "before_cursor_execute", capture)
+
+            for statement, parameters in captured:
+                result = await conn.exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + statement, parameters
+                )
+                plan = result.scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                for table in _seq_scans(plan[0]["Plan"]):
+                    problems.append((table, statement))
+        finally:
+            await trans.rollback()
+    return problems
+
+
+def test_hot_queries_are_index_backed(migrated_db):
+    problems = run_async(check_query_plans)
+
+    assert not problems, "\n\n".join(
+        f"Seq Scan on {table}:\n{statement}" for table, statement in problems
+    )
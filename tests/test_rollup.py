@@ -0,0 +1,59 @@
+import asyncio
+from datetime import date
+
+from sqlalchemy import insert, select
+
+from conftest import run_async
+from db import open_async_session
+from models.models import GoalDailyProgress, SubGoals, SubGoalDailyCompletion
+from services.rollup_service import rebuild_daily_progress
+from services.streak_service import record_completion
+from test_streak_rebuild import _seed_goal
+
+DAY = date(2026, 3, 2)
+
+
+def test_rebuild_waits_for_in_flight_completions(test_user):
+    async def scenario():
+        async with open_async_session() as db:
+            # One completion already committed, but missing from the rollup.
+            goal_id = await _seed_goal(db, test_user.id, [], partial_days=[DAY])
+            second = (
+                await db.scalars(
+                    select(SubGoals.id)
+                    .where(SubGoals.goal_id == goal_id)
+                    .order_by(SubGoals.id.desc())
+                )
+            ).first()
+            await db.commit()
+
+        async def rebuild():
+            async with open_async_session() as db:
+                await rebuild_daily_progress(db, [goal_id])
+                await db.commit()
+
+        async with open_async_session() as completing:
+            await completing.execute(
+                insert(SubGoalDailyCompletion).values(subgoal_id=second, completed_on=DAY)
+            )
+            await record_completion(completing, goal_id, DAY, 1.0, today=DAY)
+
+            rebuilding = asyncio.create_task(rebuild())
+            await asyncio.sleep(0.3)
+            blocked = not rebuilding.done()
+            await completing.commit()
+        await rebuilding
+
+        async with open_async_session() as db:
+            row = (
+                await db.execute(
+                    select(GoalDailyProgress.done_weight, GoalDailyProgress.completed_count)
+                    .where(GoalDailyProgress.goal_id == goal_id)
+                )
+            ).one()
+        return blocked, tuple(row)
+
+    blocked, row = run_async(scenario)
+
+    assert blocked
+    assert row == (2.0, 2)
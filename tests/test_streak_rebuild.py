@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+
+from sqlalchemy import insert, select
+
+from conftest import run_async
+from db import open_async_session
+from models.models import Goals, GoalStreakRuns, SubGoals, SubGoalDailyCompletion
+from services.rollup_service import rebuild_daily_progress
+from services.streak_service import rebuild_goal_streaks
+
+TODAY = date(2026, 3, 31)
+
+
+async def _seed_goal(db, user_id, qualifying_days, partial_days=()):
+    goal_id = await db.scalar(
+        insert(Goals)
+        .values(user_id=user_id, title="rebuild", total_days=90, start_date=date(2026, 1, 1))
+        .returning(Goals.id)
+    )
+    first, second = (
+        await db.scalars(
+            insert(SubGoals).returning(SubGoals.id, sort_by_parameter_order=True),
+            [
+                {"goal_id": goal_id, "name": "a", "weight": 1.0},
+                {"goal_id": goal_id, "name": "b", "weight": 1.0},
+            ],
+        )
+    ).all()
+    rows = [
+        {"subgoal_id": subgoal_id, "completed_on": day}
+        for day in qualifying_days
+        for subgoal_id in (first, second)
+    ]
+    rows += [{"subgoal_id": first, "completed_on": day} for day in partial_days]
+    if rows:
+        await db.execute(insert(SubGoalDailyCompletion), rows)
+    return goal_id
+
+
+def _days(start, count):
+    return [start + timedelta(days=i) for i in range(count)]
+
+
+def test_rebuild_groups_qualifying_days_into_runs(test_user):
+    async def scenario():
+        async with open_async_session() as db:
+            # Runs of 3 and 5 days; a half-done day breaks nothing on its own.
+            days = _days(date(2026, 3, 1), 3) + _days(TODAY - timedelta(days=5), 5)
+            goal_id = await _seed_goal(
+                db, test_user.id, days, partial_days=[date(2026, 3, 4)]
+            )
+            stale_id = await _seed_goal(db, test_user.id, _days(date(2026, 3, 10), 4))
+            empty_id = await _seed_goal(db, test_user.id, [])
+
+            await rebuild_daily_progress(db, [goal_id, stale_id, empty_id])
+            await rebuild_goal_streaks(db, [goal_id, stale_id, empty_id], today=TODAY)
+            await db.commit()
+
+            runs = (
+                await db.execute(
+                    select(GoalStreakRuns.start_day, GoalStreakRuns.end_day)
+                    .where(GoalStreakRuns.goal_id == goal_id)
+                    .order_by(GoalStreakRuns.start_day)
+                )
+            ).all()
+            goals = {
+                goal.id: goal
+                for goal in await db.scalars(
+                    select(Goals).where(Goals.id.in_([goal_id, stale_id, empty_id]))
+                )
+            }
+            return runs, goals, goal_id, stale_id, empty_id
+
+    runs, goals, goal_id, stale_id, empty_id = run_async(scenario)
+
+    assert runs == [
+        (date(2026, 3, 1), date(2026, 3, 3)),
+        (TODAY - timedelta(days=5), TODAY - timedelta(days=1)),
+    ]
+    assert goals[goal_id].longest_streak == 5
+    assert goals[goal_id].current_streak == 5
+    assert goals[goal_id].last_streak_day == TODAY - timedelta(days=1)
+
+    assert goals[stale_id].longest_streak == 4
+    assert goals[stale_id].current_streak == 0
+
+    assert goals[empty_id].longest_streak == 0
+    assert goals[empty_id].last_streak_day is None
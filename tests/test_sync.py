@@ -0,0 +1,100 @@
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+
+from conftest import run_async
+from db import open_async_session
+from models.models import SubGoalDailyCompletion, SubGoals
+from services.completion_service import complete_subgoal
+from services.sync_service import get_changes
+from test_streak_rebuild import _days, _seed_goal
+from utils.cursor import encode_cursor
+
+
+async def _sync_all(db, user, cursor=None, limit=5):
+    """Follow `has_more` to the end; returns the merged changes and pages."""
+    merged = {"goals": [], "subgoals": [], "completions": [], "deleted": []}
+    pages = 0
+    while True:
+        page = await get_changes(db, user, cursor, limit=limit)
+        pages += 1
+        for kind in merged:
+            merged[kind] += page[kind]
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            return merged, cursor, pages
+
+
+def test_sync_pages_full_and_incremental_changes(test_user):
+    async def scenario():
+        async with open_async_session() as db:
+            first_id = await _seed_goal(db, test_user.id, _days(date(2026, 1, 1), 3))
+            second_id = await _seed_goal(db, test_user.id, _days(date(2026, 1, 1), 3))
+            await db.commit()
+            subgoals = {
+                row.id: row.goal_id
+                for row in await db.execute(
+                    select(SubGoals.id, SubGoals.goal_id)
+                    .where(SubGoals.goal_id.in_([first_id, second_id]))
+                )
+            }
+            completions = await db.scalars(
+                select(SubGoalDailyCompletion.id)
+                .where(SubGoalDailyCompletion.subgoal_id.in_(subgoals))
+            )
+            completion_ids = set(completions)
+
+            full, cursor, pages = await _sync_all(db, test_user)
+            unchanged = await get_changes(db, test_user, cursor)
+
+            # A new completion bumps its goal, and only that goal.
+            touched = min(s for s, g in subgoals.items() if g == first_id)
+            await complete_subgoal(db, test_user, touched, date(2026, 1, 10))
+            after_insert, cursor, _ = await _sync_all(db, test_user, cursor)
+
+            removed = min(s for s, g in subgoals.items() if g == second_id)
+            await db.execute(delete(SubGoals).where(SubGoals.id == removed))
+            await db.commit()
+            after_delete, _, _ = await _sync_all(db, test_user, cursor)
+
+        return (
+            first_id, second_id, subgoals, completion_ids, touched, removed,
+            full, pages, unchanged, after_insert, after_delete,
+        )
+
+    (
+        first_id, second_id, subgoals, completion_ids, touched, removed,
+        full, pages, unchanged, after_insert, after_delete,
+    ) = run_async(scenario)
+
+    # 2 goals, 4 sub-goals and 12 completions, 5 per page, none repeated.
+    assert pages == 4
+    assert sorted(g["id"] for g in full["goals"]) == sorted([first_id, second_id])
+    assert sorted(s["id"] for s in full["subgoals"]) == sorted(subgoals)
+    assert sorted(c["id"] for c in full["completions"]) == sorted(completion_ids)
+    assert full["deleted"] == []
+
+    assert not any(unchanged[kind] for kind in ("goals", "subgoals", "completions", "deleted"))
+    assert unchanged["has_more"] is False
+
+    assert [g["id"] for g in after_insert["goals"]] == [first_id]
+    assert after_insert["subgoals"] == []
+    assert [(c["subgoal_id"], c["completed_on"]) for c in after_insert["completions"]] == [
+        (touched, date(2026, 1, 10))
+    ]
+
+    assert {"entity": "subgoal", "id": removed} in after_delete["deleted"]
+    assert [g["id"] for g in after_delete["goals"]] == [second_id]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor({"x": 1})])
+def test_sync_rejects_an_invalid_cursor(test_user, cursor):
+    async def scenario():
+        async with open_async_session() as db:
+            with pytest.raises(HTTPException) as excinfo:
+                await get_changes(db, test_user, cursor)
+        return excinfo.value
+
+    assert run_async(scenario).status_code == 400
@@ -0,0 +1,53 @@
+"""
+Opaque pagination cursors.
+
+Cursors are URL-safe base64 encoded JSON objects. Clients must treat them
+as opaque strings and only echo back what the API returned.
+"""
+
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(payload: dict) -> str:
+    """
+    Encode a cursor payload into an opaque string.
+
+    Args:
+        payload (dict): JSON-serializable cursor position.
+
+    Returns:
+        str: URL-safe cursor token.
+    """
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Opaque cursor token.
+
+    Returns:
+        dict: Decoded cursor position.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeEncodeError):
+        payload = None
+
+    if not isinstance(payload, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return payload
@@ -3,18 +3,28 @@ Authentication dependency utilities.
 
 This module provides reusable FastAPI dependencies related to authentication,
 including extraction and validation of the current authenticated user from
-a bearer access token.
+a bearer access token, and the internal token guarding operational endpoints.
 """
 
+import hmac
+import os
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from db import get_db
+from db import get_async_db, get_db
 from utils.security import decode_access_token
+from utils.user_cache import Principal, load_principal
 from models.models import Users
 
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+# Shared secret for the /metrics endpoints; unset disables them.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
 
 
 def get_current_user(
@@ -50,3 +60,56 @@ def get_current_user(
         )
 
     return user
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """
+    Retrieve a cached principal for the authenticated user.
+
+    Unlike `get_current_user`, this does not load the `Users` row on every
+    request: the principal is served from the user cache and the database
+    is only queried on a cache miss. Use it for endpoints that only need
+    the user's id or basic profile fields.
+
+    Args:
+        credentials (HTTPAuthorizationCredentials): Bearer token credentials.
+        db (AsyncSession): Active asyncio database session.
+
+    Returns:
+        Principal: Lightweight authenticated user.
+
+    Raises:
+        HTTPException:
+            - 401 if the token is invalid or the user does not exist.
+    """
+    payload = decode_access_token(credentials.credentials)
+    return await load_principal(db, payload["user_id"])
+
+
+def require_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+) -> None:
+    """
+    Guard operational endpoints with the internal `METRICS_TOKEN`.
+
+    Scrapers send it as a bearer token. When `METRICS_TOKEN` is not
+    configured the endpoints are disabled.
+
+    Raises:
+        HTTPException:
+            - 404 if `METRICS_TOKEN` is not configured.
+            - 401 if the bearer token is missing or does not match.
+    """
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode("utf-8"), METRICS_TOKEN.encode("utf-8")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
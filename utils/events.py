@@ -0,0 +1,228 @@
+"""
+Per-user event broker for real-time pushes.
+
+Connected clients subscribe to their user's events and receive them through
+a bounded in-memory queue. Services publish after their transaction
+commits. Publishing goes through a pluggable backend so events reach
+subscribers on every worker process:
+
+- `LocalEventBackend` (default) delivers within the current process only.
+- `PostgresNotifyBackend` fans events out to all workers with Postgres
+  ``LISTEN/NOTIFY`` over a dedicated asyncpg connection.
+
+The backend is chosen with `EVENTS_BACKEND` ("local" or "postgres") and
+started by the application lifespan. A subscriber that falls behind has
+its queue replaced by a single "resync" event, telling the client to
+refetch instead of growing memory without bound.
+"""
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from typing import Callable, Optional, Protocol
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "local").lower()
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", 100))
+EVENTS_PG_CHANNEL = os.getenv("EVENTS_PG_CHANNEL", "goal_events")
+EVENTS_PG_RECONNECT_SECONDS = float(os.getenv("EVENTS_PG_RECONNECT_SECONDS", 5))
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+_PG_MAX_PAYLOAD = 7999
+
+RESYNC_EVENT = orjson.dumps({"type": "resync"})
+
+Deliver = Callable[[int, bytes], None]
+
+
+class EventBackend(Protocol):
+    """Transport that carries published events to every worker's broker."""
+
+    async def start(self, deliver: Deliver) -> None: ...
+
+    async def stop(self) -> None: ...
+
+    async def publish(self, user_id: int, event: bytes) -> None: ...
+
+
+class LocalEventBackend:
+    """Delivers events to subscribers of the current process only."""
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+    async def publish(self, user_id: int, event: bytes) -> None:
+        if self._deliver is not None:
+            self._deliver(user_id, event)
+
+
+class PostgresNotifyBackend:
+    """
+    Fans events out to all workers with Postgres LISTEN/NOTIFY.
+
+    One asyncpg connection per worker listens on `channel` and is also used
+    to publish. It is re-established in the background if it drops. Events
+    too large for a NOTIFY payload are replaced by a "resync" event. The
+    DSN defaults to the async database URL and is resolved on `start`.
+    """
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        channel: str = EVENTS_PG_CHANNEL,
+        reconnect_seconds: float = EVENTS_PG_RECONNECT_SECONDS,
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+        self._deliver: Optional[Deliver] = None
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        user_id, _, event = payload.partition(":")
+        try:
+            self._deliver(int(user_id), event.encode("utf-8"))
+        except ValueError:
+            logger.warning("Ignoring malformed event payload on %s", self.channel)
+
+    async def _listen_loop(self) -> None:
+        import asyncpg  # pylint: disable=import-outside-toplevel
+
+        while True:
+            lost = asyncio.Event()
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.dsn)
+                conn.add_termination_listener(lambda _conn: lost.set())
+                await conn.add_listener(self.channel, self._on_notify)
+                self._conn = conn
+                await lost.wait()
+            except Exception:  # pylint: disable=broad-except
+                # asyncpg.InterfaceError is not a PostgresError; any failure
+                # is retried and only cancellation ends the loop.
+                logger.warning("Event listener connection failed", exc_info=True)
+            finally:
+                self._conn = None
+                if conn is not None and not conn.is_closed():
+                    conn.terminate()
+            await asyncio.sleep(self.reconnect_seconds)
+
+    async def start(self, deliver: Deliver) -> None:
+        if self.dsn is None:
+            from db import async_database_url  # pylint: disable=import-outside-toplevel
+
+            url = async_database_url().set(drivername="postgresql")
+            self.dsn = url.render_as_string(hide_password=False)
+        self._deliver = deliver
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def publish(self, user_id: int, event: bytes) -> None:
+        payload = f"{user_id}:{event.decode('utf-8')}"
+        if len(payload.encode("utf-8")) > _PG_MAX_PAYLOAD:
+            payload = f"{user_id}:{RESYNC_EVENT.decode('utf-8')}"
+
+        conn = self._conn
+        if conn is None:
+            logger.warning("Dropping event for user %s: listener not connected", user_id)
+            return
+        async with self._lock:
+            await conn.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+
+
+class EventBroker:
+    """Routes published events to the queues of a user's subscribers."""
+
+    def __init__(self, backend: EventBackend, queue_size: int = EVENTS_QUEUE_SIZE):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        """Register a new subscriber queue for `user_id`."""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        """Remove a subscriber queue registered with `subscribe`."""
+        queues = self._subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def deliver(self, user_id: int, event: bytes) -> None:
+        """Hand an event to this process's subscribers of `user_id`."""
+        for queue in self._subscribers.get(user_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC_EVENT)
+
+    async def publish(self, user_id: int, event_type: str, data: dict) -> None:
+        """
+        Publish an event to all of the user's subscribers.
+
+        Must be called after the change it describes has been committed.
+        Delivery is best effort; failures are logged, never raised.
+        """
+        event = orjson.dumps({"type": event_type, **data})
+        try:
+            await self.backend.publish(user_id, event)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Publishing %s event failed", event_type, exc_info=True)
+
+    async def start(self) -> None:
+        """Start the backend on the running loop."""
+        await self.backend.start(self.deliver)
+
+    async def stop(self) -> None:
+        """Stop the backend."""
+        await self.backend.stop()
+
+    def subscriber_count(self) -> int:
+        """Return the number of subscriber queues in this process."""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+def _build_backend() -> EventBackend:
+    if EVENTS_BACKEND == "postgres":
+        return PostgresNotifyBackend()
+    return LocalEventBackend()
+
+
+event_broker = EventBroker(_build_backend())
+
+
+def set_event_backend(backend: EventBackend) -> None:
+    """Replace the event backend; call before the broker is started."""
+    event_broker.backend = backend
+
+
+async def publish_event(user_id: int, event_type: str, data: dict) -> None:
+    """Publish an event on the shared broker."""
+    await event_broker.publish(user_id, event_type, data)
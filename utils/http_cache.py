@@ -0,0 +1,67 @@
+"""
+HTTP conditional-request helpers.
+
+Goal reads are tagged with a strong ETag derived from the user's goals
+version and the request parameters. Clients revalidate with
+If-None-Match and receive 304 Not Modified while nothing has changed.
+"""
+
+import hashlib
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+
+# Responses are per user and must be revalidated before reuse.
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Return a strong ETag for the given version parts."""
+    digest = hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return True if an If-None-Match header value matches `etag`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    # If-None-Match uses weak comparison.
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def cache_headers(etag: str) -> dict:
+    """Return the caching headers sent with goal reads."""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    """Return a 304 response for `etag`."""
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+async def conditional_json(
+    request: Request,
+    etag: str,
+    build: Callable[[], Awaitable],
+) -> Response:
+    """
+    Answer a conditional GET.
+
+    Returns 304 without calling `build` when the client's If-None-Match
+    matches `etag`, otherwise the built content as JSON with caching
+    headers.
+    """
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    return ORJSONResponse(await build(), headers=cache_headers(etag))
+
+
+def conditional_body(request: Request, etag: str, body: bytes) -> Response:
+    """Answer a conditional GET with an already serialized JSON body."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    return Response(body, media_type="application/json", headers=cache_headers(etag))
@@ -0,0 +1,57 @@
+"""
+Shared outbound HTTP client.
+
+A single connection-pooled `httpx.AsyncClient` is created for the lifetime
+of the application (see the lifespan hook in `main.py`) so outbound calls
+reuse keep-alive connections instead of paying a TLS handshake each time.
+"""
+
+import os
+from typing import Optional
+
+import httpx
+
+HTTP_CLIENT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CLIENT_TIMEOUT_SECONDS", 10))
+HTTP_CLIENT_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", 100))
+HTTP_CLIENT_MAX_KEEPALIVE = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE", 20))
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=HTTP_CLIENT_TIMEOUT_SECONDS,
+        limits=httpx.Limits(
+            max_connections=HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_CLIENT_MAX_KEEPALIVE,
+        ),
+    )
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client if it does not exist yet."""
+    global _client  # pylint: disable=global-statement
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and release its connections."""
+    global _client  # pylint: disable=global-statement
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared client.
+
+    The client is created on first use when the application lifespan has
+    not started it (e.g. in scripts).
+    """
+    global _client  # pylint: disable=global-statement
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
@@ -0,0 +1,114 @@
+"""
+JSON Web Key Set cache.
+
+Signing keys are fetched from a JWKS endpoint, kept in memory and refreshed
+in the background according to the endpoint's Cache-Control max-age, so
+verifying an id_token never needs a network round trip on the request path.
+An unknown key id triggers a rate-limited on-demand refresh to pick up key
+rotations early.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Optional
+
+import httpx
+
+from utils.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class JWKSCache:
+    """In-memory JWKS keyed by `kid` with background refresh."""
+
+    def __init__(
+        self,
+        url: str,
+        refresh_seconds: float = 3600,
+        min_refresh_interval: float = 30,
+        retry_seconds: float = 60,
+    ):
+        self.url = url
+        self.refresh_seconds = refresh_seconds
+        self.min_refresh_interval = min_refresh_interval
+        self.retry_seconds = retry_seconds
+        self._keys: dict = {}
+        self._fetched_at = 0.0
+        self._max_age = refresh_seconds
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> None:
+        """
+        Fetch the key set and replace the cached keys.
+
+        Raises:
+            httpx.HTTPError: If the endpoint cannot be reached or errors.
+            ValueError: If the response is not a JWKS document.
+        """
+        resp = await get_http_client().get(self.url)
+        resp.raise_for_status()
+        try:
+            keys = resp.json().get("keys", [])
+            self._keys = {key["kid"]: key for key in keys if "kid" in key}
+        except (AttributeError, TypeError) as exc:
+            raise ValueError(f"Malformed JWKS from {self.url}") from exc
+        self._fetched_at = time.monotonic()
+
+        match = _MAX_AGE.search(resp.headers.get("cache-control", ""))
+        self._max_age = int(match.group(1)) if match else self.refresh_seconds
+
+    async def get_key(self, kid: str) -> Optional[dict]:
+        """
+        Return the JWK for `kid`, refreshing once if it is unknown.
+
+        Returns:
+            dict | None: The matching JWK, or None if the endpoint does not
+            publish it.
+
+        Raises:
+            httpx.HTTPError, ValueError: If the on-demand refresh fails.
+        """
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        async with self._lock:
+            key = self._keys.get(kid)
+            if key is None and (
+                time.monotonic() - self._fetched_at >= self.min_refresh_interval
+                or not self._fetched_at
+            ):
+                await self.refresh()
+                key = self._keys.get(kid)
+        return key
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+                delay = max(self._max_age, self.min_refresh_interval)
+            except (httpx.HTTPError, ValueError):
+                logger.warning("JWKS refresh from %s failed", self.url, exc_info=True)
+                delay = self.retry_seconds
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        """Start refreshing keys in the background on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Cancel the background refresh task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,58 @@
+"""
+Bounded worker pool for password hashing.
+
+bcrypt is deliberately slow, so hashing and verification run on a
+dedicated thread pool instead of the shared threadpool that serves sync
+route handlers. The number of in-flight jobs (running plus queued) is
+capped; once the cap is reached new jobs are rejected immediately with a
+503 so a burst of logins cannot starve the rest of the API.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", 4))
+PASSWORD_POOL_QUEUE_LIMIT = int(os.getenv("PASSWORD_POOL_QUEUE_LIMIT", 32))
+
+
+class PasswordWorkPool:
+    """Thread pool with a hard limit on running plus queued jobs."""
+
+    def __init__(self, workers: int, queue_limit: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="password-worker",
+        )
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+
+    async def run(self, fn, *args):
+        """
+        Run `fn(*args)` on the pool and await its result.
+
+        Raises:
+            HTTPException: 503 if the pool is saturated.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        """Stop accepting work and let running jobs finish."""
+        self._executor.shutdown(wait=False)
+
+
+password_pool = PasswordWorkPool(PASSWORD_POOL_WORKERS, PASSWORD_POOL_QUEUE_LIMIT)
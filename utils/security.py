@@ -4,16 +4,20 @@ JWT security utilities.
 This module provides helper functions for creating and validating
 JWT access and refresh tokens used for authentication in the application.
 It supports configurable expiration, token typing, and secure decoding
-with appropriate HTTP error handling.
+with appropriate HTTP error handling. Verified access tokens are cached by
+digest so repeated requests with the same bearer token skip re-verification.
 """
 
+import hashlib
 import os
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from dotenv import load_dotenv
+from utils.cache import TTLCache
 
 load_dotenv()
 
@@ -23,8 +27,14 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
 REFRESH_SECRET_KEY = os.getenv("REFRESH_SECRET_KEY", SECRET_KEY)
 
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", 10000))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", 300))
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified access-token payloads keyed by SHA-256 digest of the token.
+_token_cache = TTLCache(TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_TTL_SECONDS)
+
 
 # TOKEN CREATION
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -77,6 +87,11 @@ def decode_access_token(token: str):
     Raises:
         HTTPException: If token is invalid or not an access token.
     """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    cached = _token_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         if payload.get("token_type") != "access":
@@ -88,12 +103,33 @@ def decode_access_token(token: str):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                                 detail="Invalid token")
 
-        return {"user_id": user_id}
+        decoded = {"user_id": user_id}
+        # Never serve a cached token past its own expiry.
+        expires_in = payload.get("exp", 0) - time.time()
+        ttl = min(TOKEN_CACHE_TTL_SECONDS, expires_in)
+        if ttl > 0:
+            _token_cache.set(key, decoded, ttl)
+        return dict(decoded)
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail="Invalid token")
 
 
+def token_cache_stats():
+    """
+    Return access-token verification cache statistics.
+
+    Returns:
+        dict: size, maxsize, hits, misses and hit_rate.
+    """
+    return _token_cache.stats()
+
+
+def clear_token_cache():
+    """Drop all cached access-token verifications."""
+    _token_cache.clear()
+
+
 def decode_refresh_token(token: str):
     """
     Decode and validate a JWT refresh token.
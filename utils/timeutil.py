@@ -0,0 +1,67 @@
+"""
+Timezone helpers.
+
+Every user has an IANA timezone that defines their day boundary. `ZoneInfo`
+objects are cached per zone name, so resolving a user's "today" on the
+request path costs one clock read and an offset lookup.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+DEFAULT_TIMEZONE = "UTC"
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> ZoneInfo:
+    """
+    Return the cached `ZoneInfo` for an IANA zone name.
+
+    Raises:
+        ZoneInfoNotFoundError: If the zone does not exist.
+    """
+    return ZoneInfo(name)
+
+
+def is_valid_timezone(name: str) -> bool:
+    """Return True if `name` is a known IANA zone."""
+    try:
+        get_zone(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+def local_today(tz_name: str | None, now: datetime | None = None) -> date:
+    """
+    Return the current date in the given zone.
+
+    Args:
+        tz_name (str | None): IANA zone name; UTC if None.
+        now (datetime | None): Aware reference instant; defaults to now.
+
+    Returns:
+        date: The local calendar day.
+    """
+    now = now or datetime.now(timezone.utc)
+    return now.astimezone(get_zone(tz_name or DEFAULT_TIMEZONE)).date()
+
+
+def group_zones_by_utc_offset(
+    zones: Iterable[str],
+    now: datetime | None = None,
+) -> dict[timedelta, list[str]]:
+    """
+    Group zone names by their UTC offset at `now`.
+
+    Zones with the same offset share the same local day and midnight, so a
+    batch job can process each group's day boundary in one pass.
+    """
+    now = now or datetime.now(timezone.utc)
+    groups = defaultdict(list)
+    for name in zones:
+        groups[now.astimezone(get_zone(name)).utcoffset()].append(name)
+    return dict(groups)
@@ -0,0 +1,104 @@
+"""
+Authenticated-user principal cache.
+
+Authenticated requests only need a handful of user fields, so instead of
+loading the `Users` row on every request, a lightweight `Principal` is
+cached per user id. The default backend is an in-process TTL/LRU cache;
+a shared backend can be plugged in with `set_user_cache_backend`.
+
+Entries must be invalidated with `invalidate_user` whenever a cached
+field changes. Deleting a `Users` row through the ORM invalidates it
+automatically.
+"""
+
+import os
+from dataclasses import dataclass
+
+from fastapi import HTTPException, status
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import Users
+from utils.cache import CacheBackend, TTLCache
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", 10000))
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Lightweight, cacheable view of an authenticated user."""
+
+    id: int
+    username: str | None
+    email: str
+    has_password: bool
+    timezone: str = "UTC"
+
+
+_backend: CacheBackend = TTLCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS)
+
+
+def set_user_cache_backend(backend: CacheBackend) -> None:
+    """Replace the principal cache backend (e.g. with a shared store)."""
+    global _backend  # pylint: disable=global-statement
+    _backend = backend
+
+
+def get_user_cache_backend() -> CacheBackend:
+    """Return the active principal cache backend."""
+    return _backend
+
+
+def _key(user_id: int) -> str:
+    return f"principal:{user_id}"
+
+
+async def load_principal(db: AsyncSession, user_id: int) -> Principal:
+    """
+    Return the principal for `user_id`, querying the database on a miss.
+
+    Raises:
+        HTTPException: 401 if the user does not exist.
+    """
+    principal = _backend.get(_key(user_id))
+    if principal is not None:
+        return principal
+
+    row = (
+        await db.execute(
+            select(
+                Users.id,
+                Users.username,
+                Users.email,
+                Users.password_hash,
+                Users.timezone,
+            )
+            .where(Users.id == user_id)
+        )
+    ).first()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+
+    principal = Principal(
+        id=row.id,
+        username=row.username,
+        email=row.email,
+        has_password=row.password_hash is not None,
+        timezone=row.timezone,
+    )
+    _backend.set(_key(user_id), principal)
+    return principal
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop the cached principal for `user_id`."""
+    _backend.delete(_key(user_id))
+
+
+@event.listens_for(Users, "after_delete")
+def _invalidate_deleted_user(_mapper, _connection, target):
+    invalidate_user(target.id)